@@ -4,9 +4,9 @@ Poskytuje možnost úpravy jasu, kontrastu, sytosti a gamma korekce.
 """
 
 import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter, ImageStat
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 @dataclass
 class ColorCorrection:
@@ -39,30 +39,102 @@ class ColorCorrection:
         if self.sharpen < 0:
             raise ValueError("Hodnota doostření musí být větší nebo rovna 0")
     
-    def apply_to_image(self, image: Image.Image) -> Image.Image:
+    def apply_to_image(self, image: Image.Image, contrast_mean: Optional[int] = None,
+                       sharpen_mean: Optional[int] = None) -> Image.Image:
         """
         Aplikuje barevnou korekci na obrázek.
         
         Args:
             image: PIL Image objekt
+            contrast_mean: Průměrný jas, vůči kterému se upravuje kontrast. Pokud není zadán,
+                spočítá se z obrázku samotného. Při zpracování po částech (pásech řádků)
+                je nutné předat průměr celého obrázku (viz compute_contrast_mean).
+            sharpen_mean: Průměrný jas masky doostření (obdobně jako contrast_mean,
+                viz compute_sharpen_mean).
             
         Returns:
             PIL Image objekt s aplikovanou barevnou korekcí
         """
         # Vytvoříme kopii obrázku, abychom nemodifikovali originál
-        img = image.copy()
+        rgb_img, alpha = self._split_alpha(image.copy())
         
-        # Zjistíme, zda má obrázek alfa kanál
-        has_alpha = img.mode == 'RGBA'
+        rgb_img = self._correct_tones(rgb_img, contrast_mean)
         
-        # Pokud má obrázek alfa kanál, oddělíme ho
-        if has_alpha:
+        # Aplikace doostření
+        if self.sharpen > 0:
+            rgb_img = self._sharpen(rgb_img, sharpen_mean)
+        
+        return self._merge_alpha(rgb_img, alpha)
+    
+    def apply_tones(self, image: Image.Image, contrast_mean: Optional[int] = None) -> Image.Image:
+        """
+        Aplikuje barevnou korekci bez doostření (jas, kontrast, sytost, gamma).
+        
+        Jde o bodové operace, při zpracování po pásech proto není potřeba přesah.
+        Doostření se pak aplikuje zvlášť přes apply_sharpen.
+        
+        Args:
+            image: PIL Image objekt
+            contrast_mean: Průměrný jas celého obrázku pro kontrast (viz compute_contrast_mean)
+            
+        Returns:
+            PIL Image objekt s aplikovanou korekcí
+        """
+        rgb_img, alpha = self._split_alpha(image.copy())
+        return self._merge_alpha(self._correct_tones(rgb_img, contrast_mean), alpha)
+    
+    def apply_sharpen(self, image: Image.Image, sharpen_mean: Optional[int] = None) -> Image.Image:
+        """
+        Aplikuje doostření na obrázek, který už prošel apply_tones.
+        
+        Args:
+            image: PIL Image objekt
+            sharpen_mean: Průměrný jas masky doostření celého obrázku (viz compute_sharpen_mean)
+            
+        Returns:
+            PIL Image objekt s aplikovaným doostřením
+        """
+        if self.sharpen <= 0:
+            return image.copy()
+        rgb_img, alpha = self._split_alpha(image)
+        return self._merge_alpha(self._sharpen(rgb_img, sharpen_mean), alpha)
+    
+    @staticmethod
+    def _split_alpha(img: Image.Image) -> Tuple[Image.Image, Optional[Image.Image]]:
+        """Oddělí od obrázku alfa kanál (pokud ho má)"""
+        if img.mode == 'RGBA':
             # Rozdělíme obrázek na RGB a alfa kanál
-            rgb_img = img.convert('RGB')
-            alpha = img.split()[3]
+            return img.convert('RGB'), img.split()[3]
+        return img, None
+    
+    @staticmethod
+    def _merge_alpha(rgb_img: Image.Image, alpha: Optional[Image.Image]) -> Image.Image:
+        """Vrátí obrázku původní alfa kanál (pokud ho měl)"""
+        if alpha is None:
+            return rgb_img
+        # Převedeme RGB obrázek zpět na RGBA a přidáme původní alfa kanál
+        r, g, b = rgb_img.split()
+        return Image.merge('RGBA', (r, g, b, alpha))
+    
+    def _sharpen(self, rgb_img: Image.Image, sharpen_mean: Optional[int] = None) -> Image.Image:
+        """Doostří RGB obrázek"""
+        # Vytvoříme masku doostření
+        blurred = rgb_img.filter(ImageFilter.GaussianBlur(radius=2))
+        mask = ImageEnhance.Brightness(rgb_img).enhance(1.0 + self.sharpen)
+        if sharpen_mean is None:
+            mask = ImageEnhance.Contrast(mask).enhance(1.0 + self.sharpen)
         else:
-            rgb_img = img
+            # Stejný postup jako ImageEnhance.Contrast, jen s předaným průměrem
+            degenerate = Image.new('L', mask.size, sharpen_mean).convert(mask.mode)
+            mask = Image.blend(degenerate, mask, 1.0 + self.sharpen)
         
+        # Aplikujeme masku doostření
+        return Image.blend(blurred, mask, self.sharpen)
+    
+    def _correct_tones(self, rgb_img: Image.Image, contrast_mean: Optional[int] = None) -> Image.Image:
+        """
+        Aplikuje jas, kontrast, sytost a gamma korekci na RGB obrázek (vše kromě doostření).
+        """
         # Aplikace jasu
         if self.brightness != 1.0:
             enhancer = ImageEnhance.Brightness(rgb_img)
@@ -70,8 +142,13 @@ class ColorCorrection:
         
         # Aplikace kontrastu
         if self.contrast != 1.0:
-            enhancer = ImageEnhance.Contrast(rgb_img)
-            rgb_img = enhancer.enhance(self.contrast)
+            if contrast_mean is None:
+                enhancer = ImageEnhance.Contrast(rgb_img)
+                rgb_img = enhancer.enhance(self.contrast)
+            else:
+                # Stejný postup jako ImageEnhance.Contrast, jen s předaným průměrem
+                degenerate = Image.new('L', rgb_img.size, contrast_mean).convert(rgb_img.mode)
+                rgb_img = Image.blend(degenerate, rgb_img, self.contrast)
         
         # Aplikace sytosti
         if self.saturation != 1.0:
@@ -92,23 +169,47 @@ class ColorCorrection:
             # Vytvoříme nový PIL Image
             rgb_img = Image.fromarray(img_array)
         
-        # Aplikace doostření
-        if self.sharpen > 0:
-            # Vytvoříme masku doostření
-            blurred = rgb_img.filter(ImageFilter.GaussianBlur(radius=2))
-            mask = ImageEnhance.Brightness(rgb_img).enhance(1.0 + self.sharpen)
-            mask = ImageEnhance.Contrast(mask).enhance(1.0 + self.sharpen)
-            
-            # Aplikujeme masku doostření
-            rgb_img = Image.blend(blurred, mask, self.sharpen)
+        return rgb_img
+    
+    def compute_contrast_mean(self, images: Iterable[Image.Image]) -> int:
+        """
+        Spočítá průměrný jas, který by pro úpravu kontrastu použil apply_to_image
+        na celý obrázek složený z předaných částí.
         
-        # Pokud měl původní obrázek alfa kanál, přidáme ho zpět
-        if has_alpha:
-            # Převedeme RGB obrázek zpět na RGBA a přidáme původní alfa kanál
-            r, g, b = rgb_img.split()
-            rgb_img = Image.merge('RGBA', (r, g, b, alpha))
+        Args:
+            images: Části obrázku (např. pásy řádků) jako PIL Image objekty
+            
+        Returns:
+            Průměrný jas po aplikaci jasu (0-255)
+        """
+        total = 0.0
+        count = 0
+        for image in images:
+            rgb_img = image.convert('RGB')
+            if self.brightness != 1.0:
+                rgb_img = ImageEnhance.Brightness(rgb_img).enhance(self.brightness)
+            total += ImageStat.Stat(rgb_img.convert('L')).sum[0]
+            count += rgb_img.width * rgb_img.height
+        return int(total / max(1, count) + 0.5)
+    
+    def compute_sharpen_mean(self, images: Iterable[Image.Image]) -> int:
+        """
+        Spočítá průměrný jas masky doostření, který by apply_to_image použil
+        na celý obrázek složený z předaných částí.
         
-        return rgb_img
+        Args:
+            images: Části obrázku po apply_tones (např. pásy řádků, bez přesahu)
+            
+        Returns:
+            Průměrný jas masky doostření (0-255)
+        """
+        total = 0.0
+        count = 0
+        for image in images:
+            mask = ImageEnhance.Brightness(image.convert('RGB')).enhance(1.0 + self.sharpen)
+            total += ImageStat.Stat(mask.convert('L')).sum[0]
+            count += mask.width * mask.height
+        return int(total / max(1, count) + 0.5)
     
     @classmethod
     def from_dict(cls, data: dict) -> 'ColorCorrection':
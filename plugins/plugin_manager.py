@@ -32,7 +32,18 @@ class PluginManager:
         Returns:
             Seznam načtených pluginů
         """
-        self.plugins = []
+        return self.instantiate_plugins(self.discover_plugin_classes(), predefined_order)
+        
+    def discover_plugin_classes(self):
+        """
+        Naimportuje moduly pluginů z adresáře a vrátí nalezené třídy pluginů.
+        
+        Nevytváří žádné instance (ani Qt objekty), lze tedy volat i z vlákna na pozadí.
+        
+        Returns:
+            Seznam tříd pluginů
+        """
+        plugin_classes = []
         for file in os.listdir(self.plugin_dir):
             # Pokud se jedná o shapefile_clip_plugin, přeskočíme ho
             if file == "shapefile_clip_plugin.py" or file == "shapefile_clip_plugin":
@@ -49,12 +60,33 @@ class PluginManager:
                     for attr_name in dir(mod):
                         attr = getattr(mod, attr_name)
                         if isinstance(attr, type) and issubclass(attr, PluginBase) and attr is not PluginBase:
-                            # Vytvoříme instanci pluginu a předáme app_config
-                            plugin_instance = attr(self.app_config) if self.app_config else attr()
-                            self.plugins.append(plugin_instance)
+                            plugin_classes.append(attr)
                             self.plugin_modules[attr.__name__] = mod
                 except Exception as e:
                     print(f"Chyba při načítání pluginu {file}: {str(e)}")
+        return plugin_classes
+        
+    def instantiate_plugins(self, plugin_classes, predefined_order=None):
+        """
+        Vytvoří instance zadaných tříd pluginů a seřadí je podle zadaného pořadí.
+        
+        Musí běžet v hlavním (GUI) vlákně, pluginy vytvářejí Qt objekty.
+        
+        Args:
+            plugin_classes: Třídy pluginů z discover_plugin_classes
+            predefined_order: Seznam názvů tříd pluginů v požadovaném pořadí
+            
+        Returns:
+            Seznam načtených pluginů
+        """
+        self.plugins = []
+        for plugin_class in plugin_classes:
+            try:
+                # Vytvoříme instanci pluginu a předáme app_config
+                plugin_instance = plugin_class(self.app_config) if self.app_config else plugin_class()
+                self.plugins.append(plugin_instance)
+            except Exception as e:
+                print(f"Chyba při načítání pluginu {plugin_class.__name__}: {str(e)}")
         
         # Seřazení pluginů podle zadaného pořadí nebo výchozího PREDEFINED_ORDER
         order = predefined_order if predefined_order is not None else PREDEFINED_ORDER
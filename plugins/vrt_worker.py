@@ -4,18 +4,23 @@ Poskytuje odhad zbývajícího času a detailnější informace o průběhu zpra
 """
 
 import os
+import re
+import subprocess
 import time
+import unicodedata
 import logging
 import gc
 from typing import List, Dict, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future, TimeoutError
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 
 from PySide6.QtCore import QThread, Signal
 
-from osgeo import gdal
-import numpy as np
-from PIL import Image
+# Těžké moduly (GDAL, numpy, PIL) se importují až při prvním použití
+# v _load_heavy_modules(), aby import pluginu nezdržoval start aplikace.
+gdal = None
+np = None
+Image = None
 
 # Nastavení loggeru
 logger = logging.getLogger("VRTCreation")
@@ -26,18 +31,32 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+def _load_heavy_modules():
+    """
+    Naimportuje GDAL, numpy a PIL a přiřadí je do modulových jmen.
+    Volá se na začátku funkcí, které je potřebují; po prvním volání je to jen kontrola.
+    """
+    global gdal, np, Image
+    if gdal is None:
+        from osgeo import gdal as _gdal
+        import numpy as _np
+        from PIL import Image as _Image
+        np, Image = _np, _Image
+        gdal = _gdal
+
+# Povolené znaky v názvu souboru – ostatní sanitize_filename odstraní
+_SANITIZE_RE = re.compile(r'[^A-Za-z0-9_-]')
+
 def sanitize_filename(name: str) -> str:
     """
     Sanitizuje řetězec pro použití v názvu souboru.
     """
-    import unicodedata
-    import re
     # Převede diakritiku a další speciální znaky na odpovídající ASCII verze.
     normalized = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII')
     # Nahrazení mezer pomlčkami
     normalized = normalized.replace(" ", "-")
     # Odstraní ostatní nepovolené znaky, ponechá jen písmena, čísla, podtržítka a pomlčky.
-    return re.sub(r'[^A-Za-z0-9_-]', '', normalized)
+    return _SANITIZE_RE.sub('', normalized)
 
 def map_resampling_method(method: str) -> str:
     """
@@ -49,20 +68,53 @@ def map_resampling_method(method: str) -> str:
         return "near"
     return method
 
+# Velikost bloku pro čtení souborů z /vsimem/ (4 MB)
+VSI_READ_CHUNK_SIZE = 4 << 20
+
+# Počet řádků zpracovávaných najednou při barevné korekci
+CC_STRIP_HEIGHT = 256
+# Přesah pásu (v řádcích) pro doostření, které pracuje s okolím pixelu
+CC_STRIP_HALO = 16
+
 def read_vsifile(filepath: str) -> bytes:
     """
     Otevře soubor z /vsimem/ a načte celý jeho obsah.
+    Čte po blocích VSI_READ_CHUNK_SIZE do předem alokovaného bufferu,
+    aby se u velkých dlaždic předešlo jedné obří alokaci.
     """
+    _load_heavy_modules()
     fp = gdal.VSIFOpenL(filepath, "rb")
     if fp is None:
         raise Exception(f"Nelze otevřít {filepath} pro čtení.")
-    # Přesun na konec a zjištění velikosti
-    gdal.VSIFSeekL(fp, 0, 2)
-    filesize = gdal.VSIFTellL(fp)
-    gdal.VSIFSeekL(fp, 0, 0)
-    data = gdal.VSIFReadL(1, filesize, fp)
-    gdal.VSIFCloseL(fp)
-    return data
+    try:
+        # Přesun na konec a zjištění velikosti
+        gdal.VSIFSeekL(fp, 0, 2)
+        filesize = gdal.VSIFTellL(fp)
+        gdal.VSIFSeekL(fp, 0, 0)
+        buf = bytearray(filesize)
+        mv = memoryview(buf)
+        offset = 0
+        while offset < filesize:
+            chunk = gdal.VSIFReadL(1, min(VSI_READ_CHUNK_SIZE, filesize - offset), fp)
+            if not chunk:
+                raise Exception(f"Neočekávaný konec souboru {filepath} při čtení.")
+            mv[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    finally:
+        gdal.VSIFCloseL(fp)
+    return bytes(buf)
+
+def probe_image_mode(filepath: str) -> Optional[str]:
+    """
+    Zjistí barevný režim obrázku (např. "RGB", "RGBA") pouze z hlavičky souboru
+    bez dekódování pixelů. Pokud soubor nelze otevřít, vrátí None.
+    """
+    _load_heavy_modules()
+    try:
+        with Image.open(filepath) as im:
+            return im.mode
+    except Exception:
+        return None
 
 class TileProcessingStatus:
     """Třída pro sledování stavu zpracování dlaždic"""
@@ -149,6 +201,7 @@ class VRTCreationWorker(QThread):
 
     def cleanup_memory(self):
         """Explicitně uvolní paměť a spustí garbage collector"""
+        _load_heavy_modules()
         # Uvolnění všech GDAL datasetů v paměti
         gdal.GDALDestroyDriverManager()
         
@@ -164,34 +217,48 @@ class VRTCreationWorker(QThread):
         Všechny kroky se provádějí v paměti pomocí GDAL /vsimem/ a na disku bude vytvořen pouze finální TIFF.
         Vrací cestu k finálnímu TIFF s reprojekcí nebo None.
         """
+        _load_heavy_modules()
         max_attempts = self.options.get("max_tile_conversion_attempts", 3)
         attempt = 0
         
+        # Sanitizovaný základní identifikátor pro /vsimem/ soubory i finální výstup –
+        # mezi pokusy se nemění, proto jej spočítáme jen jednou
+        base_name = sanitize_filename(os.path.splitext(os.path.basename(tile))[0])
+        mem_prefix = f"/vsimem/{base_name}"
+        out_tile = os.path.join(os.path.dirname(tile), f"{base_name}_wgs84.tif")
+        
         while attempt < max_attempts:
             try:
-                # Vytvoříme sanitizovaný základní identifikátor pro /vsimem/ soubory
-                base_name = os.path.splitext(os.path.basename(tile))[0]
-                base_name = sanitize_filename(base_name)
-                mem_prefix = f"/vsimem/{base_name}"
-                
-                # 1) Konverze PNG -> GeoTIFF (EPSG:3857) pomocí GDAL Translate
-                translate_options = gdal.TranslateOptions(format="GTiff", outputSRS="EPSG:3857")
+                # 1) Konverze PNG -> GeoTIFF (EPSG:3857) pomocí GDAL Translate.
+                # U RGB zdroje bez alfa kanálu přidáme alfu rovnou z masky (-b mask),
+                # čímž odpadá samostatný Warp průchod celým rastrem v kroku 2.
+                if probe_image_mode(tile) == "RGB":
+                    translate_options = gdal.TranslateOptions(["-colorinterp_4", "alpha"],
+                                                              format="GTiff",
+                                                              outputSRS="EPSG:3857",
+                                                              bandList=[1, 2, 3, "mask"])
+                else:
+                    translate_options = gdal.TranslateOptions(format="GTiff", outputSRS="EPSG:3857")
                 ds_3857 = gdal.Translate(mem_prefix + "_merc.tif", tile, options=translate_options)
                 if ds_3857 is None:
                     raise Exception(f"Konverze {tile} do GeoTIFF selhala.")
+                # Vlastnosti datasetu si zapamatujeme, abychom /vsimem/ soubor
+                # v dalších krocích nemuseli znovu otevírat jen kvůli jejich čtení
+                band_count = ds_3857.RasterCount
+                width = ds_3857.RasterXSize
+                height = ds_3857.RasterYSize
+                geotransform = ds_3857.GetGeoTransform()
+                projection = ds_3857.GetProjection()
                 ds_3857 = None  # Zavřeme dataset – soubor je v /vsimem/
                 
-                # 2) Kontrola počtu kanálů; pokud je méně než 4, přidáme alfa kanál
-                ds_temp = gdal.Open(mem_prefix + "_merc.tif")
-                if ds_temp is None:
-                    raise Exception("Nelze otevřít GDAL dataset z /vsimem/ po konverzi.")
-                band_count = ds_temp.RasterCount
-                ds_temp = None
+                # 2) Kontrola počtu kanálů; pokud je stále méně než 4 (např. paletové
+                # nebo šedotónové PNG), přidáme alfa kanál pomocí Warp
                 if band_count < 4:
                     warp_opts_alpha = gdal.WarpOptions(format="GTiff", dstAlpha=True)
                     ds_alpha = gdal.Warp(mem_prefix + "_merc_alpha.tif", mem_prefix + "_merc.tif", options=warp_opts_alpha)
                     if ds_alpha is None:
                         raise Exception("Přidání alfa kanálu selhalo.")
+                    band_count = ds_alpha.RasterCount
                     ds_alpha = None
                     # Přepíšeme původní soubor v paměti
                     buffer = read_vsifile(mem_prefix + "_merc_alpha.tif")
@@ -210,6 +277,9 @@ class VRTCreationWorker(QThread):
                     ds_downscaled = gdal.Warp(mem_prefix + "_merc_ds.tif", mem_prefix + "_merc.tif", options=warp_opts_downscale)
                     if ds_downscaled is None:
                         raise Exception("Downscale selhal.")
+                    width = ds_downscaled.RasterXSize
+                    height = ds_downscaled.RasterYSize
+                    geotransform = ds_downscaled.GetGeoTransform()
                     ds_downscaled = None
                     # Přepíšeme původní dataset v paměti
                     buffer = read_vsifile(mem_prefix + "_merc_ds.tif")
@@ -223,58 +293,77 @@ class VRTCreationWorker(QThread):
                                          color_correction.contrast != 1.0 or 
                                          color_correction.saturation != 1.0 or 
                                          color_correction.gamma != 1.0):
-                    # Načtení datasetu do PIL Image
+                    # Korekce probíhá po pásech řádků (CC_STRIP_HEIGHT), takže v paměti
+                    # není najednou celá dlaždice v několika kopiích
                     ds_temp = gdal.Open(mem_prefix + "_merc.tif")
                     if ds_temp is None:
                         raise Exception("Nelze otevřít dataset pro barevnou korekci.")
                     
-                    # Převod GDAL datasetu na PIL Image
-                    width = ds_temp.RasterXSize
-                    height = ds_temp.RasterYSize
-                    bands = ds_temp.RasterCount
-                    
-                    # Načtení dat z jednotlivých pásem
+                    bands = band_count
                     if bands == 4:  # RGBA
-                        r_band = ds_temp.GetRasterBand(1).ReadAsArray()
-                        g_band = ds_temp.GetRasterBand(2).ReadAsArray()
-                        b_band = ds_temp.GetRasterBand(3).ReadAsArray()
-                        a_band = ds_temp.GetRasterBand(4).ReadAsArray()
-                        img_array = np.stack((r_band, g_band, b_band, a_band), axis=2)
+                        band_list, pil_mode = (1, 2, 3, 4), 'RGBA'
                     else:  # RGB nebo jiný počet pásem
-                        r_band = ds_temp.GetRasterBand(1).ReadAsArray()
-                        g_band = ds_temp.GetRasterBand(2).ReadAsArray()
-                        b_band = ds_temp.GetRasterBand(3).ReadAsArray()
-                        img_array = np.stack((r_band, g_band, b_band), axis=2)
+                        band_list, pil_mode = (1, 2, 3), 'RGB'
                     
-                    ds_temp = None  # Zavřeme dataset
+                    def read_rows(ds, y_off: int, rows: int, band_indices=band_list) -> np.ndarray:
+                        return np.dstack([ds.GetRasterBand(b).ReadAsArray(0, y_off, width, rows)
+                                          for b in band_indices])
                     
-                    # Vytvoření PIL Image
-                    if bands == 4:
-                        pil_img = Image.fromarray(img_array, 'RGBA')
-                    else:
-                        pil_img = Image.fromarray(img_array, 'RGB')
-                    
-                    # Aplikace barevné korekce
-                    corrected_img = color_correction.apply_to_image(pil_img)
+                    def read_strip(y_off: int, rows: int, band_indices=band_list, mode=pil_mode) -> Image.Image:
+                        return Image.fromarray(read_rows(ds_temp, y_off, rows, band_indices), mode)
                     
-                    # Převod zpět na numpy array
-                    corrected_array = np.array(corrected_img)
+                    # Kontrast se počítá vůči průměrnému jasu celé dlaždice
+                    contrast_mean = None
+                    if color_correction.contrast != 1.0:
+                        contrast_mean = color_correction.compute_contrast_mean(
+                            read_strip(y0, min(CC_STRIP_HEIGHT, height - y0), (1, 2, 3), 'RGB')
+                            for y0 in range(0, height, CC_STRIP_HEIGHT)
+                        )
                     
                     # Vytvoření nového GDAL datasetu s korigovanými daty
                     driver = gdal.GetDriverByName('GTiff')
                     color_corrected_ds = driver.Create(mem_prefix + "_color_corrected.tif", 
                                                       width, height, bands, gdal.GDT_Byte)
                     
-                    # Zápis dat do jednotlivých pásem
-                    for i in range(bands):
-                        band = color_corrected_ds.GetRasterBand(i+1)
-                        band.WriteArray(corrected_array[:, :, i])
-                    
                     # Kopírování georeference
-                    ds_temp = gdal.Open(mem_prefix + "_merc.tif")
-                    color_corrected_ds.SetGeoTransform(ds_temp.GetGeoTransform())
-                    color_corrected_ds.SetProjection(ds_temp.GetProjection())
-                    ds_temp = None
+                    color_corrected_ds.SetGeoTransform(geotransform)
+                    color_corrected_ds.SetProjection(projection)
+                    
+                    def write_rows(array: np.ndarray, y_off: int):
+                        # Zápis dat do jednotlivých pásem
+                        for i in range(bands):
+                            color_corrected_ds.GetRasterBand(i+1).WriteArray(array[:, :, i], 0, y_off)
+                    
+                    # Jas, kontrast, sytost a gamma jsou bodové operace – pásy bez přesahu
+                    for y0 in range(0, height, CC_STRIP_HEIGHT):
+                        rows = min(CC_STRIP_HEIGHT, height - y0)
+                        corrected_img = color_correction.apply_tones(read_strip(y0, rows),
+                                                                     contrast_mean=contrast_mean)
+                        write_rows(np.asarray(corrected_img), y0)
+                    
+                    if color_correction.sharpen > 0:
+                        # Kontrast masky doostření se počítá vůči průměru celé dlaždice – z už
+                        # korigovaných pásů, takže se korekce tónů nepočítá podruhé
+                        sharpen_mean = color_correction.compute_sharpen_mean(
+                            Image.fromarray(read_rows(color_corrected_ds, y0, min(CC_STRIP_HEIGHT, height - y0),
+                                                      (1, 2, 3)), 'RGB')
+                            for y0 in range(0, height, CC_STRIP_HEIGHT)
+                        )
+                        # Doostření pracuje s okolím pixelu, proto pásy bereme s přesahem. Pásy
+                        # se přepisují na místě, nedoostřené řádky nad pásem si proto držíme zvlášť
+                        carry = None
+                        for y0 in range(0, height, CC_STRIP_HEIGHT):
+                            rows = min(CC_STRIP_HEIGHT, height - y0)
+                            bottom = min(height, y0 + rows + CC_STRIP_HALO)
+                            below = read_rows(color_corrected_ds, y0, bottom - y0)
+                            strip = below if carry is None else np.concatenate((carry, below))
+                            offset = 0 if carry is None else len(carry)
+                            sharpened = color_correction.apply_sharpen(Image.fromarray(strip, pil_mode),
+                                                                       sharpen_mean=sharpen_mean)
+                            carry = below[max(0, rows - CC_STRIP_HALO):rows]
+                            write_rows(np.asarray(sharpened)[offset:offset + rows], y0)
+                    
+                    ds_temp = None  # Zavřeme dataset
                     
                     # Uložení a zavření datasetu
                     color_corrected_ds.FlushCache()
@@ -287,19 +376,13 @@ class VRTCreationWorker(QThread):
                     gdal.Unlink(mem_prefix + "_color_corrected.tif")
                 
                 # 5) Reprojekce do WGS84 (EPSG:4326)
-                ds_temp = gdal.Open(mem_prefix + "_merc.tif")
-                if ds_temp is None:
-                    raise Exception("Nelze otevřít dataset v paměti pro reprojekci.")
-                input_width = ds_temp.RasterXSize
-                input_height = ds_temp.RasterYSize
-                ds_temp = None
                 nodata = self.options.get("nodata")
                 warp_opts_reproj = gdal.WarpOptions(format="GTiff",
                                                     dstSRS="EPSG:4326",
                                                     srcSRS="EPSG:3857",
                                                     resampleAlg=map_resampling_method(self.options.get("resampling", "nearest")),
-                                                    width=input_width,
-                                                    height=input_height,
+                                                    width=width,
+                                                    height=height,
                                                     dstNodata=nodata if nodata is not None else None)
                 ds_wgs84 = gdal.Warp(mem_prefix + "_wgs84.tif", mem_prefix + "_merc.tif", options=warp_opts_reproj)
                 if ds_wgs84 is None:
@@ -315,11 +398,6 @@ class VRTCreationWorker(QThread):
                 if ds_final is None:
                     raise Exception("Nelze otevřít reprojektovaný dataset.")
                 driver = gdal.GetDriverByName("GTiff")
-                # Získáme původní název, sanitizujeme pouze základ
-                original_basename = os.path.basename(tile)
-                base, _ = os.path.splitext(original_basename)
-                base = sanitize_filename(base)
-                out_tile = os.path.join(os.path.dirname(tile), f"{base}_wgs84.tif")
                 driver.CreateCopy(out_tile, ds_final)
                 ds_final = None
                 
@@ -347,64 +425,95 @@ class VRTCreationWorker(QThread):
         return None
 
     def process_batch(self, batch: List[str]) -> List[str]:
-        """Zpracuje dávku dlaždic paralelně a vrátí seznam úspěšně zpracovaných dlaždic"""
+        """
+        Zpracuje dávku dlaždic paralelně a vrátí seznam úspěšně zpracovaných dlaždic.
+        Současně běží nejvýše max_workers*2 úloh, další dlaždice se odesílají průběžně
+        po dokončení předchozích, aby se omezila špičková spotřeba paměti.
+        """
         successful_tiles = []
+        max_in_flight = self.max_workers * 2
+        tiles_iter = iter(batch)
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_tile = {executor.submit(self.convert_tile, tile): tile for tile in batch}
+            future_to_tile = {}
             
-            for future in as_completed(future_to_tile):
-                if not self.is_running:
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    return successful_tiles
+            def submit_next() -> Optional[Future]:
+                tile = next(tiles_iter, None)
+                if tile is None:
+                    return None
+                future = executor.submit(self.convert_tile, tile)
+                future_to_tile[future] = tile
+                return future
+            
+            # Počáteční naplnění – nejvýše max_in_flight rozpracovaných dlaždic
+            pending = set()
+            while len(pending) < max_in_flight:
+                future = submit_next()
+                if future is None:
+                    break
+                pending.add(future)
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
                 
-                tile = future_to_tile[future]
-                try:
-                    result = future.result(timeout=self.TILE_CONVERSION_TIMEOUT)
-                    success = result is not None
-                    
-                    # Aktualizace stavu
-                    status_info = self.status.update(success)
-                    
-                    # Formátování odhadovaného času dokončení
-                    eta_str = ""
-                    if status_info["estimated_completion"]:
-                        eta_str = status_info["estimated_completion"].strftime("%H:%M:%S")
+                for future in done:
+                    if not self.is_running:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        return successful_tiles
                     
-                    # Pravidelné uvolňování paměti po každých 10 dlaždicích
-                    if status_info['processed'] % 10 == 0:
-                        self.cleanup_memory()
-                    
-                    # Vytvoření informační zprávy
-                    msg = (f"Zpracováno {status_info['processed']}/{status_info['total']} dlaždic "
-                           f"({status_info['percent']:.1f}%), "
-                           f"úspěšných: {status_info['successful']}, "
-                           f"neúspěšných: {status_info['failed']}, "
-                           f"rychlost: {status_info['processing_speed']:.2f} dlaždic/s, "
-                           f"odhadovaný čas dokončení: {eta_str}")
-                    
-                    # Emitování signálů pro aktualizaci GUI
-                    self.status_message.emit(msg)
-                    self.progress_updated.emit(
-                        status_info['processed'], 
-                        status_info['total'] * 2,  # *2 protože máme ještě druhou fázi (tvorba VRT)
-                        status_info
-                    )
-                    
-                    if success:
-                        successful_tiles.append(result)
+                    tile = future_to_tile.pop(future)
+                    try:
+                        result = future.result(timeout=self.TILE_CONVERSION_TIMEOUT)
+                        success = result is not None
+                        
+                        # Aktualizace stavu
+                        status_info = self.status.update(success)
+                        
+                        # Formátování odhadovaného času dokončení
+                        eta_str = ""
+                        if status_info["estimated_completion"]:
+                            eta_str = status_info["estimated_completion"].strftime("%H:%M:%S")
+                        
+                        # Pravidelné uvolňování paměti po každých 10 dlaždicích
+                        if status_info['processed'] % 10 == 0:
+                            self.cleanup_memory()
+                        
+                        # Vytvoření informační zprávy
+                        msg = (f"Zpracováno {status_info['processed']}/{status_info['total']} dlaždic "
+                               f"({status_info['percent']:.1f}%), "
+                               f"úspěšných: {status_info['successful']}, "
+                               f"neúspěšných: {status_info['failed']}, "
+                               f"rychlost: {status_info['processing_speed']:.2f} dlaždic/s, "
+                               f"odhadovaný čas dokončení: {eta_str}")
+                        
+                        # Emitování signálů pro aktualizaci GUI
+                        self.status_message.emit(msg)
+                        self.progress_updated.emit(
+                            status_info['processed'], 
+                            status_info['total'] * 2,  # *2 protože máme ještě druhou fázi (tvorba VRT)
+                            status_info
+                        )
+                        
+                        if success:
+                            successful_tiles.append(result)
+                        
+                    except TimeoutError:
+                        logger.error(f"Konverze dlaždice {tile} vypršela (timeout).")
+                        self.status.update(False)
+                    except Exception as ex:
+                        logger.error(f"Chyba u dlaždice {tile}: {ex}")
+                        self.status.update(False)
                     
-                except TimeoutError:
-                    logger.error(f"Konverze dlaždice {tile} vypršela (timeout).")
-                    self.status.update(False)
-                except Exception as ex:
-                    logger.error(f"Chyba u dlaždice {tile}: {ex}")
-                    self.status.update(False)
+                    # Za každou dokončenou dlaždici odešleme další
+                    next_future = submit_next()
+                    if next_future is not None:
+                        pending.add(next_future)
         
         return successful_tiles
 
     def run(self):
         try:
+            _load_heavy_modules()
             logger.info(f"Spouštím zpracování {len(self.tiles)} dlaždic")
             self.status_message.emit(f"Zahajuji zpracování {len(self.tiles)} dlaždic...")
             
@@ -460,7 +569,7 @@ class VRTCreationWorker(QThread):
             self.progress_updated.emit(len(self.tiles) + 1, len(self.tiles) * 2, {})
             
             # Pro vytvoření VRT používáme externí volání
-            vrt_result = os.system(" ".join(cmd_vrt))
+            vrt_result = subprocess.run(cmd_vrt, check=False).returncode
             if vrt_result != 0:
                 raise Exception(f"Vytvoření VRT selhalo s kódem {vrt_result}")
             
@@ -473,7 +582,7 @@ class VRTCreationWorker(QThread):
             logger.info(f"Odstraňuji extra kanál pomocí: {' '.join(cmd_fix)}")
             self.status_message.emit("Optimalizuji VRT vrstvu...")
             
-            fix_result = os.system(" ".join(cmd_fix))
+            fix_result = subprocess.run(cmd_fix, check=False).returncode
             if fix_result == 0:
                 os.replace(fixed_vrt, self.output_file)
             else:
@@ -489,7 +598,7 @@ class VRTCreationWorker(QThread):
                 self.status_message.emit("Vytvářím JPEG náhled...")
                 
                 try:
-                    jpg_result = os.system(" '.join(cmd_jpg)")
+                    jpg_result = subprocess.run(cmd_jpg, check=False).returncode
                     if jpg_result == 0:
                         logger.info(f"JPEG vytvořen: {jpg_output}")
                     else:
@@ -7,7 +7,6 @@ from .theme_manager import ThemeManager
 from .status_panel import StatusPanelComponent
 from .notification import NotificationComponent
 from .settings import SettingsComponent
-from .help import HelpComponent
 from .keyboard_shortcuts import KeyboardShortcutsComponent
 
 __all__ = [
@@ -22,3 +21,11 @@ __all__ = [
     'HelpComponent',
     'KeyboardShortcutsComponent'
 ]
+
+
+def __getattr__(name):
+    # HelpComponent is imported on first access, the help module is not needed at startup
+    if name == 'HelpComponent':
+        from .help import HelpComponent
+        return HelpComponent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
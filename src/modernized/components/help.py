@@ -1,31 +1,136 @@
+import gzip
+import os
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+
 from PySide6.QtWidgets import (QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QTabWidget, QTextBrowser, QListWidget,
                              QListWidgetItem, QSplitter, QDialogButtonBox, QScrollArea,
                              QLineEdit)
-from PySide6.QtCore import Qt, Signal, QUrl, QSize
-from PySide6.QtGui import QFont, QIcon, QPixmap
+from PySide6.QtCore import Qt, Signal, QUrl, QSize, QTimer
+from PySide6.QtGui import QFont, QIcon, QPixmap, QTextDocument
+
+# Adresář s HTML obsahem jednotlivých témat nápovědy (soubory <id>.html.gz)
+_TOPICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "help_topics")
+
+@lru_cache(maxsize=None)
+def _get_topic_html(topic_id):
+    """
+    Načte a dekomprimuje HTML obsah tématu při prvním použití,
+    nebo vrátí None, pokud téma neexistuje
+    """
+    try:
+        with open(os.path.join(_TOPICS_DIR, f"{topic_id}.html.gz"), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+    except OSError:
+        return None
+
+def _kmp_table(pattern):
+    """Vrátí tabulku nejdelších vlastních prefixů, které jsou i sufixy (LPS), pro algoritmus KMP"""
+    lps = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = lps[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        lps[i] = k
+    return lps
+
+def _kmp_find_records(corpus, offsets, pattern):
+    """
+    Projde korpus algoritmem KMP a vrátí indexy záznamů obsahujících pattern.
+    offsets obsahuje počáteční pozice jednotlivých záznamů v korpusu (vzestupně).
+    Po prvním nálezu v záznamu se skenování přesune rovnou na začátek dalšího záznamu.
+    """
+    lps = _kmp_table(pattern)
+    found = []
+    m = len(pattern)
+    n = len(corpus)
+    i = k = 0
+    while i < n:
+        ch = corpus[i]
+        while k and ch != pattern[k]:
+            k = lps[k - 1]
+        if ch == pattern[k]:
+            k += 1
+            if k == m:
+                record = bisect_right(offsets, i) - 1
+                found.append(record)
+                if record + 1 >= len(offsets):
+                    break
+                i = offsets[record + 1]
+                k = 0
+                continue
+        i += 1
+    return found
+
+# Témata nápovědy v pořadí, v jakém se zobrazují v seznamu
+_TOPICS = (
+    {"id": "intro", "title": "Úvod do aplikace"},
+    {"id": "interface", "title": "Uživatelské rozhraní"},
+    {"id": "plugins", "title": "Práce s pluginy"},
+    {"id": "maps", "title": "Práce s mapami"},
+    {"id": "export", "title": "Export dat"},
+    {"id": "shortcuts", "title": "Klávesové zkratky"},
+    {"id": "faq", "title": "Často kladené otázky"},
+)
+
+# Záznamy pro vyhledávání (v reálné aplikaci by se prohledával skutečný obsah)
+_SEARCH_ENTRIES = (
+    {"id": "intro", "title": "Úvod do aplikace", "match": "aplikace, úvod, začátek"},
+    {"id": "interface", "title": "Uživatelské rozhraní", "match": "rozhraní, panel, pluginy"},
+    {"id": "plugins", "title": "Práce s pluginy", "match": "plugin, rozšíření, funkce"},
+)
+
+# Identifikátory témat jsou internované – řetězce vrácené z QVariant (Qt.UserRole)
+# se internují také, takže porovnání a vyhledávání v cache je porovnáním identity
+for _entry in _TOPICS + _SEARCH_ENTRIES:
+    _entry["id"] = sys.intern(_entry["id"])
+del _entry
 
 class HelpComponent:
     """Komponenta nápovědy s interaktivním průvodcem a dokumentací"""
     
+    # Dialog nápovědy je statický, sdílí ho proto všechny instance komponenty;
+    # odkaz se zahodí, jakmile Qt dialog zničí (např. spolu s rodičovským oknem)
+    _shared_dialog = None
+    
     def __init__(self, parent=None):
         self.parent = parent
-        self.help_dialog = None
+        self._tour_dialog = None
+        
+    @property
+    def help_dialog(self):
+        """Sdílený dialog nápovědy (None, dokud nebyl poprvé zobrazen)"""
+        return HelpComponent._shared_dialog
         
     def show_help(self, topic=None):
         """Zobrazí dialog nápovědy s volitelným tématem"""
-        if not self.help_dialog:
-            self.help_dialog = HelpDialog(self.parent)
+        dialog = HelpComponent._shared_dialog
+        if dialog is None:
+            dialog = HelpComponent._shared_dialog = HelpDialog(self.parent)
+            dialog.destroyed.connect(HelpComponent._forget_shared_dialog)
+        elif dialog.parent() is not self.parent:
+            # Zachováme příznaky okna, setParent je jinak resetuje
+            dialog.setParent(self.parent, dialog.windowFlags())
             
         if topic:
-            self.help_dialog.select_topic(topic)
+            dialog.select_topic(topic)
             
-        self.help_dialog.show()
+        dialog.show()
+        
+    @staticmethod
+    def _forget_shared_dialog(*_):
+        """Zahodí odkaz na sdílený dialog zničený spolu s rodičem"""
+        HelpComponent._shared_dialog = None
         
     def show_quick_tour(self):
         """Zobrazí rychlého průvodce aplikací"""
-        tour = QuickTourDialog(self.parent)
-        tour.exec()
+        if self._tour_dialog is None:
+            self._tour_dialog = QuickTourDialog(self.parent)
+        self._tour_dialog.exec()
         
     def show_tooltip(self, widget, text):
         """Nastaví tooltip pro widget s formátovaným textem"""
@@ -46,11 +151,31 @@ class HelpDialog(QDialog):
         # Hlavní layout
         layout = QVBoxLayout(self)
         
-        # Záložky nápovědy
+        # Záložky nápovědy – jejich obsah se sestaví až při prvním zobrazení
         self.tab_widget = QTabWidget()
+        self._tab_builders = {0: self._init_content_tab, 1: self._init_search_tab}
+        self.tab_widget.addTab(QWidget(), "Obsah")
+        self.tab_widget.addTab(QWidget(), "Vyhledávání")
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+        
+        layout.addWidget(self.tab_widget)
         
-        # Záložka obsahu
-        content_tab = QWidget()
+        # Tlačítka
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+        
+        # Aktuální (první) záložka je viditelná hned, sestavíme ji tedy rovnou
+        self._ensure_tab(self.tab_widget.currentIndex())
+        
+    def _ensure_tab(self, index):
+        """Sestaví obsah záložky při jejím prvním zobrazení"""
+        builder = self._tab_builders.pop(index, None)
+        if builder:
+            builder(self.tab_widget.widget(index))
+        
+    def _init_content_tab(self, content_tab):
+        """Sestaví záložku obsahu"""
         content_layout = QVBoxLayout(content_tab)
         
         # Rozdělení na seznam témat a obsah
@@ -65,6 +190,9 @@ class HelpDialog(QDialog):
         self.content_browser = QTextBrowser()
         self.content_browser.setOpenExternalLinks(True)
         
+        # Cache již naparsovaných dokumentů jednotlivých témat
+        self._doc_cache = {}
+        
         splitter.addWidget(self.topic_list)
         splitter.addWidget(self.content_browser)
         splitter.setStretchFactor(0, 1)
@@ -72,8 +200,8 @@ class HelpDialog(QDialog):
         
         content_layout.addWidget(splitter)
         
-        # Záložka vyhledávání
-        search_tab = QWidget()
+    def _init_search_tab(self, search_tab):
+        """Sestaví záložku vyhledávání"""
         search_layout = QVBoxLayout(search_tab)
         
         # Vyhledávací pole
@@ -94,126 +222,101 @@ class HelpDialog(QDialog):
         search_layout.addWidget(QLabel("Výsledky vyhledávání:"))
         search_layout.addWidget(self.search_results)
         
+        # Vyhledávání běží průběžně při psaní; časovač sloučí rychle po sobě
+        # jdoucí stisky kláves do jediného hledání po 150 ms klidu
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._search_help)
+        
         # Propojení signálů pro vyhledávání
-        self.search_button.clicked.connect(self._search_help)
-        self.search_edit.returnPressed.connect(self._search_help)
+        self.search_edit.textChanged.connect(self._schedule_search)
+        self.search_button.clicked.connect(self._schedule_search)
+        self.search_edit.returnPressed.connect(self._schedule_search)
         self.search_results.itemClicked.connect(self._show_search_result)
         
-        # Přidání záložek
-        self.tab_widget.addTab(content_tab, "Obsah")
-        self.tab_widget.addTab(search_tab, "Vyhledávání")
-        
-        layout.addWidget(self.tab_widget)
-        
-        # Tlačítka
-        button_box = QDialogButtonBox(QDialogButtonBox.Close)
-        button_box.rejected.connect(self.close)
-        layout.addWidget(button_box)
-        
     def _load_help_content(self):
         """Načte obsah nápovědy"""
         # Přidání témat do seznamu
-        topics = [
-            {"id": "intro", "title": "Úvod do aplikace"},
-            {"id": "interface", "title": "Uživatelské rozhraní"},
-            {"id": "plugins", "title": "Práce s pluginy"},
-            {"id": "maps", "title": "Práce s mapami"},
-            {"id": "export", "title": "Export dat"},
-            {"id": "shortcuts", "title": "Klávesové zkratky"},
-            {"id": "faq", "title": "Často kladené otázky"},
-        ]
-        
-        for topic in topics:
+        for topic in _TOPICS:
             item = QListWidgetItem(topic["title"])
             item.setData(Qt.UserRole, topic["id"])
             self.topic_list.addItem(item)
+        self._topic_row = {topic["id"]: i for i, topic in enumerate(_TOPICS)}
+            
+        # Index pro vyhledávání. Text je předem převeden na malá písmena,
+        # takže hledání jen prochází index.
+        results = _SEARCH_ENTRIES
+        # Všechny záznamy jsou spojeny do jednoho korpusu (oddělovač \0 zabraňuje
+        # nálezům přes hranici záznamů); _offsets drží začátky záznamů pro bisect.
+        self._search_index = [(result["id"], result["title"]) for result in results]
+        self._offsets = []
+        parts = []
+        position = 0
+        for result in results:
+            text = (result["title"] + "\n" + result["match"]).lower()
+            self._offsets.append(position)
+            parts.append(text)
+            position += len(text) + 1
+        self._corpus = "\0".join(parts)
             
     def _show_topic(self, index):
         """Zobrazí obsah vybraného tématu"""
         if index < 0:
             return
             
-        topic_id = self.topic_list.item(index).data(Qt.UserRole)
+        topic_id = sys.intern(self.topic_list.item(index).data(Qt.UserRole))
         self._load_topic_content(topic_id)
         
     def _load_topic_content(self, topic_id):
         """Načte obsah tématu podle ID"""
-        # Zde by se normálně načítal obsah z HTML souborů nebo databáze
-        # Pro ukázku používáme předpřipravený obsah
-        
-        content = {
-            "intro": """
-                <h1>Úvod do aplikace</h1>
-                <p>Vítejte v aplikaci Orto Pokrokové - profesionální nástroj pro zpracování ortofoto snímků a geografických dat.</p>
-                <p>Tato aplikace vám umožňuje:</p>
-                <ul>
-                    <li>Pracovat s mapovými podklady</li>
-                    <li>Stahovat ortofoto snímky</li>
-                    <li>Vytvářet VRT soubory</li>
-                    <li>Provádět reprojekce</li>
-                    <li>A mnoho dalšího...</li>
-                </ul>
-                <p>Pro začátek vyberte plugin v levém panelu a postupujte podle instrukcí.</p>
-            """,
-            "interface": """
-                <h1>Uživatelské rozhraní</h1>
-                <p>Aplikace se skládá z několika hlavních částí:</p>
-                <ul>
-                    <li><b>Levý panel</b> - seznam dostupných pluginů</li>
-                    <li><b>Pravý panel</b> - obsah aktivního pluginu</li>
-                    <li><b>Horní panel</b> - nástrojová lišta s akcemi</li>
-                    <li><b>Dolní panel</b> - stavový řádek s informacemi</li>
-                </ul>
-                <p>Mezi pluginy můžete přepínat kliknutím na jejich název v levém panelu.</p>
-            """,
-            # Další témata by byla podobně definována
-        }
-        
+        # Již zobrazené téma jen přepneme, HTML se znovu neparsuje
+        doc = self._doc_cache.get(topic_id)
+        if doc is not None:
+            self.content_browser.setDocument(doc)
+            return
+            
         # Zobrazení obsahu nebo výchozí zprávy
-        if topic_id in content:
-            self.content_browser.setHtml(content[topic_id])
+        doc = QTextDocument(self)
+        html = _get_topic_html(topic_id)
+        if html is not None:
+            doc.setHtml(html)
         else:
-            self.content_browser.setHtml(f"<h1>Téma '{topic_id}' není k dispozici</h1><p>Obsah tohoto tématu se připravuje.</p>")
+            doc.setHtml(f"<h1>Téma '{topic_id}' není k dispozici</h1><p>Obsah tohoto tématu se připravuje.</p>")
+        self._doc_cache[topic_id] = doc
+        self.content_browser.setDocument(doc)
             
     def select_topic(self, topic_id):
         """Vybere téma podle ID"""
         # Najít index tématu v seznamu
-        for i in range(self.topic_list.count()):
-            if self.topic_list.item(i).data(Qt.UserRole) == topic_id:
-                self.topic_list.setCurrentRow(i)
-                self.tab_widget.setCurrentIndex(0)  # Přepnout na záložku obsahu
-                return
-                
+        row = self._topic_row.get(topic_id)
+        if row is not None:
+            self.topic_list.setCurrentRow(row)
+            self.tab_widget.setCurrentIndex(0)  # Přepnout na záložku obsahu
+            return
+            
         # Pokud téma nebylo nalezeno, zobrazit první téma
         if self.topic_list.count() > 0:
             self.topic_list.setCurrentRow(0)
             
+    def _schedule_search(self, *_):
+        """Naplánuje (nebo odloží) vyhledávání po krátké pauze v psaní"""
+        # start() bez argumentu – start(msec) by přepsal interval časovače
+        self._search_timer.start()
+        
     def _search_help(self):
         """Vyhledá v obsahu nápovědy"""
         search_text = self.search_edit.text().lower()
+        self.search_results.clear()
         if not search_text:
             return
             
-        self.search_results.clear()
-        
-        # Simulace vyhledávání (v reálné aplikaci by se prohledával skutečný obsah)
-        results = [
-            {"id": "intro", "title": "Úvod do aplikace", "match": "aplikace, úvod, začátek"},
-            {"id": "interface", "title": "Uživatelské rozhraní", "match": "rozhraní, panel, pluginy"},
-            {"id": "plugins", "title": "Práce s pluginy", "match": "plugin, rozšíření, funkce"},
-        ]
         
-        # Filtrování výsledků
-        filtered_results = []
-        for result in results:
-            if (search_text in result["title"].lower() or 
-                search_text in result["match"].lower()):
-                filtered_results.append(result)
-                
-        # Zobrazení výsledků
-        for result in filtered_results:
-            item = QListWidgetItem(result["title"])
-            item.setData(Qt.UserRole, result["id"])
+        # Filtrování a zobrazení výsledků
+        for record in _kmp_find_records(self._corpus, self._offsets, search_text):
+            topic_id, title = self._search_index[record]
+            item = QListWidgetItem(title)
+            item.setData(Qt.UserRole, topic_id)
             self.search_results.addItem(item)
             
         # Přepnutí na záložku vyhledávání
@@ -221,7 +324,7 @@ class HelpDialog(QDialog):
         
     def _show_search_result(self, item):
         """Zobrazí výsledek vyhledávání"""
-        topic_id = item.data(Qt.UserRole)
+        topic_id = sys.intern(item.data(Qt.UserRole))
         self._load_topic_content(topic_id)
         self.tab_widget.setCurrentIndex(0)  # Přepnout na záložku obsahu
         
@@ -231,6 +334,23 @@ class HelpDialog(QDialog):
 class QuickTourDialog(QDialog):
     """Dialog s rychlým průvodcem aplikací"""
     
+    # Styl čísel kroků – nastavuje se jednou na celý obsah, ne na každý popisek
+    _NUMBER_QSS = """
+        QLabel#tourNumber {
+            background-color: #2196F3;
+            color: white;
+            border-radius: 15px;
+            min-width: 30px;
+            min-height: 30px;
+            max-width: 30px;
+            max-height: 30px;
+            font-weight: bold;
+        }
+    """
+    
+    # Sdílené písmo nadpisů kroků (vytváří se až při prvním použití)
+    _TITLE_FONT = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Rychlý průvodce aplikací")
@@ -246,8 +366,12 @@ class QuickTourDialog(QDialog):
         self.content_area.setWidgetResizable(True)
         
         content_widget = QWidget()
+        content_widget.setStyleSheet(self._NUMBER_QSS)
         content_layout = QVBoxLayout(content_widget)
         
+        if QuickTourDialog._TITLE_FONT is None:
+            QuickTourDialog._TITLE_FONT = QFont("Segoe UI", 12, QFont.Bold)
+        
         # Přidání kroků průvodce
         steps = [
             {"title": "Vítejte v aplikaci", 
@@ -267,23 +391,14 @@ class QuickTourDialog(QDialog):
             # Číslo kroku
             number_label = QLabel(str(i+1))
             number_label.setAlignment(Qt.AlignCenter)
-            number_label.setStyleSheet("""
-                background-color: #2196F3;
-                color: white;
-                border-radius: 15px;
-                min-width: 30px;
-                min-height: 30px;
-                max-width: 30px;
-                max-height: 30px;
-                font-weight: bold;
-            """)
+            number_label.setObjectName("tourNumber")
             
             # Obsah kroku
             step_content = QWidget()
             step_content_layout = QVBoxLayout(step_content)
             
             title_label = QLabel(step["title"])
-            title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+            title_label.setFont(self._TITLE_FONT)
             
             text_label = QLabel(step["text"])
             text_label.setWordWrap(True)
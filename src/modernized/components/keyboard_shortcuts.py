@@ -1,8 +1,68 @@
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QDialogButtonBox)
-from PySide6.QtCore import Qt, QSettings, QObject, Signal
+                             QTableView, QHeaderView, QDialogButtonBox)
+from PySide6.QtCore import Qt, QSettings, QObject, Signal, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QKeySequence, QShortcut, QAction
 
+# Výchozí klávesové zkratky
+_DEFAULT_SHORTCUTS = MappingProxyType({
+    "help": "F1",                    # Nápověda
+    "settings": "Ctrl+,",            # Nastavení
+    "quit": "Ctrl+Q",                # Ukončit
+    "save": "Ctrl+S",                # Uložit
+    "open": "Ctrl+O",                # Otevřít
+    "export": "Ctrl+E",              # Exportovat
+    "next_plugin": "Ctrl+Tab",       # Další plugin
+    "prev_plugin": "Ctrl+Shift+Tab", # Předchozí plugin
+    "zoom_in": "Ctrl++",             # Přiblížit
+    "zoom_out": "Ctrl+-",            # Oddálit
+    "zoom_reset": "Ctrl+0",          # Resetovat zoom
+    "toggle_theme": "Ctrl+T",        # Přepnout téma
+})
+
+# Popisy akcí pro nápovědu
+_ACTION_DESCRIPTIONS = MappingProxyType({
+    "help": "Zobrazit nápovědu",
+    "settings": "Otevřít nastavení",
+    "quit": "Ukončit aplikaci",
+    "save": "Uložit projekt",
+    "open": "Otevřít projekt",
+    "export": "Exportovat výsledky",
+    "next_plugin": "Přejít na další plugin",
+    "prev_plugin": "Přejít na předchozí plugin",
+    "zoom_in": "Přiblížit",
+    "zoom_out": "Oddálit",
+    "zoom_reset": "Resetovat zoom",
+    "toggle_theme": "Přepnout téma",
+})
+
+# Krátké popisky akcí pro tabulku v dialogu zkratek
+_ACTION_LABELS = MappingProxyType({
+    "help": "Nápověda",
+    "settings": "Nastavení",
+    "quit": "Ukončit",
+    "save": "Uložit",
+    "open": "Otevřít",
+    "export": "Exportovat",
+    "next_plugin": "Další plugin",
+    "prev_plugin": "Předchozí plugin",
+    "zoom_in": "Přiblížit",
+    "zoom_out": "Oddálit",
+    "zoom_reset": "Resetovat zoom",
+    "toggle_theme": "Přepnout téma",
+})
+
+# Příznaky needitovatelné buňky tabulky zkratek (výchozí příznaky bez ItemIsEditable)
+_READONLY_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+@lru_cache(maxsize=None)
+def _key_sequence(key):
+    """Vrátí QKeySequence pro textový zápis zkratky; každý řetězec se parsuje jen jednou"""
+    return QKeySequence(key)
+
 class KeyboardShortcutsComponent(QObject):
     """Komponenta pro správu klávesových zkratek"""
     
@@ -12,107 +72,161 @@ class KeyboardShortcutsComponent(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
-        self.shortcuts = {}
+        self.shortcuts = {}            # akce -> QKeySequence
+        self._shortcut_objects = {}    # akce -> QShortcut
+        self._shortcut_to_action = {}  # QShortcut -> akce
         self.settings = QSettings("OrtoPokrokove", "Aplikace")
         self._load_default_shortcuts()
         self._register_shortcuts()
         
     def _load_default_shortcuts(self):
         """Načte výchozí klávesové zkratky"""
-        default_shortcuts = {
-            "help": "F1",                    # Nápověda
-            "settings": "Ctrl+,",            # Nastavení
-            "quit": "Ctrl+Q",                # Ukončit
-            "save": "Ctrl+S",                # Uložit
-            "open": "Ctrl+O",                # Otevřít
-            "export": "Ctrl+E",              # Exportovat
-            "next_plugin": "Ctrl+Tab",       # Další plugin
-            "prev_plugin": "Ctrl+Shift+Tab", # Předchozí plugin
-            "zoom_in": "Ctrl++",             # Přiblížit
-            "zoom_out": "Ctrl+-",            # Oddálit
-            "zoom_reset": "Ctrl+0",          # Resetovat zoom
-            "toggle_theme": "Ctrl+T",        # Přepnout téma
-        }
-        
-        # Načtení uložených zkratek nebo použití výchozích
+        # Načtení uložených zkratek nebo použití výchozích; textový zápis
+        # se převádí na QKeySequence jen zde, dále se pracuje se sekvencemi
         self.shortcuts = {}
-        for action, default_key in default_shortcuts.items():
-            saved_key = self.settings.value(f"shortcuts/{action}", default_key)
-            self.shortcuts[action] = saved_key
+        self.settings.beginGroup("shortcuts")
+        for action, default_key in _DEFAULT_SHORTCUTS.items():
+            saved_key = self.settings.value(action, default_key)
+            self.shortcuts[sys.intern(action)] = _key_sequence(saved_key)
+        self.settings.endGroup()
             
     def _register_shortcuts(self):
         """Zaregistruje klávesové zkratky v aplikaci"""
-        # Odstranění existujících zkratek
-        if hasattr(self, "_shortcut_objects"):
-            for shortcut in self._shortcut_objects:
+        for action, sequence in self.shortcuts.items():
+            self._apply_shortcut(action, sequence)
+            
+    def _apply_shortcut(self, action, sequence):
+        """Vytvoří, změní nebo odstraní QShortcut jedné akce"""
+        shortcut = self._shortcut_objects.get(action)
+        if sequence.isEmpty():  # Prázdná zkratka – akce nemá mít QShortcut
+            if shortcut is not None:
+                del self._shortcut_objects[action]
+                del self._shortcut_to_action[shortcut]
                 shortcut.setEnabled(False)
                 shortcut.deleteLater()
-                
-        # Vytvoření nových zkratek
-        self._shortcut_objects = []
-        for action, key in self.shortcuts.items():
-            if not key:  # Přeskočit prázdné zkratky
-                continue
-                
-            shortcut = QShortcut(QKeySequence(key), self.parent)
-            shortcut.activated.connect(lambda a=action: self._shortcut_activated(a))
-            self._shortcut_objects.append(shortcut)
+            return
+            
+        if shortcut is None:
+            shortcut = QShortcut(sequence, self.parent)
+            shortcut.activated.connect(self._on_shortcut)
+            self._shortcut_objects[action] = shortcut
+            self._shortcut_to_action[shortcut] = action
+        else:
+            shortcut.setKey(sequence)
             
-    def _shortcut_activated(self, action):
-        """Zpracuje aktivaci klávesové zkratky"""
-        self.shortcut_triggered.emit(action)
+    def _on_shortcut(self):
+        """Zpracuje aktivaci klávesové zkratky – akci dohledá podle odesílatele signálu"""
+        action = self._shortcut_to_action.get(self.sender())
+        if action:
+            self.shortcut_triggered.emit(action)
+        
+    def _shortcut_strings(self):
+        """Vrátí zkratky v textovém zápisu (akce -> řetězec)"""
+        return {action: sequence.toString() for action, sequence in self.shortcuts.items()}
         
     def get_shortcut(self, action):
         """Vrátí klávesovou zkratku pro danou akci"""
-        return self.shortcuts.get(action, "")
+        sequence = self.shortcuts.get(action)
+        return sequence.toString() if sequence is not None else ""
         
     def set_shortcut(self, action, key):
         """Nastaví klávesovou zkratku pro danou akci"""
-        self.shortcuts[action] = key
+        sequence = _key_sequence(key)
+        self.shortcuts[action] = sequence
         self.settings.setValue(f"shortcuts/{action}", key)
-        self._register_shortcuts()
+        self._apply_shortcut(action, sequence)
         
     def show_shortcuts_dialog(self):
         """Zobrazí dialog pro úpravu klávesových zkratek"""
-        dialog = ShortcutsDialog(self.parent, self.shortcuts)
+        old_shortcuts = self._shortcut_strings()
+        dialog = ShortcutsDialog(self.parent, old_shortcuts)
         if dialog.exec() == QDialog.Accepted:
-            # Uložit změny
-            self.shortcuts = dialog.get_shortcuts()
-            for action, key in self.shortcuts.items():
-                self.settings.setValue(f"shortcuts/{action}", key)
-            self._register_shortcuts()
+            # Uložit změny – zapisujeme a přeregistrujeme jen změněné zkratky
+            changed = {action: key for action, key in dialog.get_shortcuts().items()
+                       if old_shortcuts.get(action) != key}
+            if not changed:
+                return
+                
+            self.settings.beginGroup("shortcuts")
+            for action, key in changed.items():
+                self.settings.setValue(action, key)
+            self.settings.endGroup()
+            self.settings.sync()
+            
+            for action, key in changed.items():
+                sequence = _key_sequence(key)
+                self.shortcuts[action] = sequence
+                self._apply_shortcut(action, sequence)
             
     def get_shortcut_descriptions(self):
         """Vrátí popis klávesových zkratek pro nápovědu"""
-        descriptions = {
-            "help": "Zobrazit nápovědu",
-            "settings": "Otevřít nastavení",
-            "quit": "Ukončit aplikaci",
-            "save": "Uložit projekt",
-            "open": "Otevřít projekt",
-            "export": "Exportovat výsledky",
-            "next_plugin": "Přejít na další plugin",
-            "prev_plugin": "Přejít na předchozí plugin",
-            "zoom_in": "Přiblížit",
-            "zoom_out": "Oddálit",
-            "zoom_reset": "Resetovat zoom",
-            "toggle_theme": "Přepnout téma",
-        }
-        
         result = {}
-        for action, desc in descriptions.items():
-            key = self.shortcuts.get(action, "")
+        for action, desc in _ACTION_DESCRIPTIONS.items():
+            key = self.get_shortcut(action)
             if key:
                 result[action] = {"key": key, "description": desc}
                 
         return result
         
+class ShortcutsTableModel(QAbstractTableModel):
+    """Model tabulky klávesových zkratek – sloupce akce a zkratka, řádky seřazené podle akce"""
+    
+    _HEADERS = ("Akce", "Klávesová zkratka")
+    
+    def __init__(self, shortcuts, parent=None):
+        super().__init__(parent)
+        self._rows = sorted(shortcuts.items())
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._HEADERS)
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        action, key = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return _ACTION_LABELS.get(action, action) if index.column() == 0 else key
+        if role == Qt.UserRole:
+            return action if index.column() == 0 else key
+        return None
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._HEADERS[section]
+        return None
+        
+    def flags(self, index):
+        # Buňky se needitují přímo, zkratka se mění přes ShortcutEditDialog
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _READONLY_FLAGS
+        
+    def action_at(self, row):
+        """Vrátí akci na daném řádku"""
+        return self._rows[row][0]
+        
+    def set_key(self, row, key):
+        """Změní zkratku na daném řádku a překreslí jen tuto buňku"""
+        self._rows[row] = (self._rows[row][0], key)
+        index = self.index(row, 1)
+        self.dataChanged.emit(index, index)
+        
+    def set_shortcuts(self, shortcuts):
+        """Nahradí všechny zkratky"""
+        self.beginResetModel()
+        self._rows = sorted(shortcuts.items())
+        self.endResetModel()
+        
 class ShortcutsDialog(QDialog):
     """Dialog pro úpravu klávesových zkratek"""
     
     def __init__(self, parent=None, shortcuts=None):
         super().__init__(parent)
         self.shortcuts = shortcuts.copy() if shortcuts else {}
+        self._edit_dialog = None
         self._init_ui()
         
     def _init_ui(self):
@@ -124,14 +238,15 @@ class ShortcutsDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # Tabulka zkratek
-        self.shortcuts_table = QTableWidget(len(self.shortcuts), 2)
-        self.shortcuts_table.setHorizontalHeaderLabels(["Akce", "Klávesová zkratka"])
+        self.shortcuts_model = ShortcutsTableModel(self.shortcuts, self)
+        self.shortcuts_table = QTableView()
+        self.shortcuts_table.setModel(self.shortcuts_model)
         self.shortcuts_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.shortcuts_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.shortcuts_table.verticalHeader().setVisible(False)
         
-        # Naplnění tabulky
-        self._fill_table()
+        # Připojení události pro změnu zkratky
+        self.shortcuts_table.clicked.connect(self._edit_shortcut)
         
         layout.addWidget(QLabel("Klikněte na zkratku pro její změnu:"))
         layout.addWidget(self.shortcuts_table)
@@ -143,78 +258,28 @@ class ShortcutsDialog(QDialog):
         button_box.button(QDialogButtonBox.Reset).clicked.connect(self._reset_shortcuts)
         layout.addWidget(button_box)
         
-    def _fill_table(self):
-        """Naplní tabulku zkratkami"""
-        # Popisky akcí
-        descriptions = {
-            "help": "Nápověda",
-            "settings": "Nastavení",
-            "quit": "Ukončit",
-            "save": "Uložit",
-            "open": "Otevřít",
-            "export": "Exportovat",
-            "next_plugin": "Další plugin",
-            "prev_plugin": "Předchozí plugin",
-            "zoom_in": "Přiblížit",
-            "zoom_out": "Oddálit",
-            "zoom_reset": "Resetovat zoom",
-            "toggle_theme": "Přepnout téma",
-        }
-        
-        row = 0
-        for action, key in sorted(self.shortcuts.items()):
-            # Akce
-            action_item = QTableWidgetItem(descriptions.get(action, action))
-            action_item.setData(Qt.UserRole, action)
-            action_item.setFlags(action_item.flags() & ~Qt.ItemIsEditable)
-            
-            # Klávesová zkratka
-            key_item = QTableWidgetItem(key)
-            key_item.setData(Qt.UserRole, key)
-            key_item.setFlags(key_item.flags() & ~Qt.ItemIsEditable)
-            
-            self.shortcuts_table.setItem(row, 0, action_item)
-            self.shortcuts_table.setItem(row, 1, key_item)
-            row += 1
-            
-        # Připojení události pro změnu zkratky
-        self.shortcuts_table.itemClicked.connect(self._edit_shortcut)
-        
-    def _edit_shortcut(self, item):
+    def _edit_shortcut(self, index):
         """Upraví klávesovou zkratku"""
-        if item.column() != 1:  # Pouze sloupec se zkratkami
+        if index.column() != 1:  # Pouze sloupec se zkratkami
             return
             
-        row = item.row()
-        action = self.shortcuts_table.item(row, 0).data(Qt.UserRole)
+        row = index.row()
+        action = self.shortcuts_model.action_at(row)
         
-        # Vytvoření dialogu pro zadání zkratky
-        shortcut_dialog = ShortcutEditDialog(self, action, self.shortcuts[action])
-        if shortcut_dialog.exec() == QDialog.Accepted:
-            new_key = shortcut_dialog.get_shortcut()
+        # Dialog pro zadání zkratky se vytváří jen jednou a před každým
+        # zobrazením se pouze přenastaví
+        if self._edit_dialog is None:
+            self._edit_dialog = ShortcutEditDialog(self)
+        self._edit_dialog.prepare(action, self.shortcuts[action])
+        if self._edit_dialog.exec() == QDialog.Accepted:
+            new_key = self._edit_dialog.get_shortcut()
             self.shortcuts[action] = new_key
-            item.setText(new_key)
-            item.setData(Qt.UserRole, new_key)
+            self.shortcuts_model.set_key(row, new_key)
             
     def _reset_shortcuts(self):
         """Resetuje zkratky na výchozí hodnoty"""
-        default_shortcuts = {
-            "help": "F1",
-            "settings": "Ctrl+,",
-            "quit": "Ctrl+Q",
-            "save": "Ctrl+S",
-            "open": "Ctrl+O",
-            "export": "Ctrl+E",
-            "next_plugin": "Ctrl+Tab",
-            "prev_plugin": "Ctrl+Shift+Tab",
-            "zoom_in": "Ctrl++",
-            "zoom_out": "Ctrl+-",
-            "zoom_reset": "Ctrl+0",
-            "toggle_theme": "Ctrl+T",
-        }
-        
-        self.shortcuts = default_shortcuts.copy()
-        self._fill_table()
+        self.shortcuts = dict(_DEFAULT_SHORTCUTS)
+        self.shortcuts_model.set_shortcuts(self.shortcuts)
         
     def get_shortcuts(self):
         """Vrátí upravené zkratky"""
@@ -240,7 +305,8 @@ class ShortcutEditDialog(QDialog):
         
         # Popisek
         layout.addWidget(QLabel(f"Zadejte novou klávesovou zkratku pro akci:"))
-        layout.addWidget(QLabel(f"<b>{self.action}</b>"))
+        self.action_label = QLabel(f"<b>{self.action}</b>")
+        layout.addWidget(self.action_label)
         
         # Pole pro zkratku
         self.shortcut_label = QLabel(self.current_shortcut)
@@ -267,6 +333,15 @@ class ShortcutEditDialog(QDialog):
         self.setFocusPolicy(Qt.StrongFocus)
         self.setFocus()
         
+    def prepare(self, action, current_shortcut):
+        """Připraví dialog pro úpravu zkratky další akce (bez nového sestavení widgetů)"""
+        self.action = action
+        self.current_shortcut = current_shortcut
+        self.new_shortcut = ""
+        self.action_label.setText(f"<b>{action}</b>")
+        self.shortcut_label.setText(current_shortcut)
+        self.setFocus()
+        
     def keyPressEvent(self, event):
         """Zachytí stisknutí kláves"""
         # Ignorovat samostatné modifikátory
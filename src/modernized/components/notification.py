@@ -1,5 +1,9 @@
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QPoint, QSize
+import heapq
+import time
+
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QGraphicsOpacityEffect
+from PySide6.QtCore import (Qt, QTimer, QEvent, QEasingCurve, QPoint, QSize,
+                            QAbstractAnimation, QVariantAnimation)
 from PySide6.QtGui import QColor, QPainter, QPainterPath, QFont, QAction
 
 class NotificationComponent(QWidget):
@@ -9,13 +13,61 @@ class NotificationComponent(QWidget):
     WARNING = 1
     ERROR = 2
     
+    _STYLE_TEMPLATE = """
+        QWidget#notification {{
+            background-color: {bg_color};
+            border-radius: 6px;
+            color: white;
+        }}
+        QLabel {{
+            color: white;
+        }}
+        QPushButton {{
+            background-color: transparent;
+            color: white;
+            border: none;
+            font-weight: bold;
+            padding: 4px;
+        }}
+        QPushButton:hover {{
+            background-color: rgba(255, 255, 255, 0.2);
+            border-radius: 4px;
+        }}
+    """
+    
+    # Styly a ikony podle typu notifikace – sestaveny jednou při importu
+    _STYLES = {
+        INFO: _STYLE_TEMPLATE.format(bg_color="#2196F3"),
+        WARNING: _STYLE_TEMPLATE.format(bg_color="#FF9800"),
+        ERROR: _STYLE_TEMPLATE.format(bg_color="#F44336"),
+    }
+    _ICONS = {INFO: "ℹ️", WARNING: "⚠️", ERROR: "❌"}
+    
+    # Při návalu notifikací se animace vynechávají: víc než _ANIMATION_LIMIT
+    # současných notifikací nebo odstup kratší než _BURST_INTERVAL sekund
+    _ANIMATION_LIMIT = 5
+    _BURST_INTERVAL = 0.05
+    
+    # Délka animace zobrazení/skrytí v sekundách
+    _FADE_DURATION = 0.3
+    
+    # Sdílený font ikony a tlačítka – vytváří se až při prvním použití (potřebuje QApplication)
+    _ICON_FONT = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self._reposition_scheduled = False
+        self._last_show = 0.0
+        self._last_remove = 0.0
+        # Cílová pozice podle geometrie rodiče – zneplatní se při jeho změně velikosti/přesunu
+        self._cached_target_pos = None
+        self._cached_width = None
+        if parent is not None:
+            parent.installEventFilter(self)
         self._init_ui()
-        self.notifications = []
-        # Uchovává aktivní animace, aby nedošlo k jejich garbage collection
-        self.active_animations = []
+        # Aktivní notifikace podle id() widgetu (slovník zachovává pořadí přidání)
+        self.notifications = {}
         
     def _init_ui(self):
         # Nastavení vlastností widgetu
@@ -35,6 +87,24 @@ class NotificationComponent(QWidget):
         self.notification_layout.setSpacing(10)
         layout.addWidget(self.notification_container)
         
+        # Všechny animace notifikací pohání jedna časová osa (jeden časovač pro všechny);
+        # průběh jednotlivých notifikací se počítá z času jejich spuštění
+        self._animating = {}
+        self._easing = QEasingCurve(QEasingCurve.OutCubic)
+        self._timeline = QVariantAnimation(self)
+        self._timeline.setStartValue(0.0)
+        self._timeline.setEndValue(1.0)
+        self._timeline.setDuration(int(self._FADE_DURATION * 1000))
+        self._timeline.setLoopCount(-1)
+        self._timeline.valueChanged.connect(self._apply_progress)
+        
+        # Automatické skrývání – jeden časovač a halda (čas vypršení, id, notifikace)
+        # místo samostatného QTimer.singleShot pro každou notifikaci
+        self._expiry_heap = []
+        self._expiry_timer = QTimer(self)
+        self._expiry_timer.setSingleShot(True)
+        self._expiry_timer.timeout.connect(self._expire_due)
+        
     def show_notification(self, message, notification_type=INFO, timeout=5000):
         """Zobrazí novou notifikaci"""
         # Vytvoření notifikačního widgetu
@@ -42,58 +112,61 @@ class NotificationComponent(QWidget):
         
         # Přidání do layoutu
         self.notification_layout.addWidget(notification)
-        self.notifications.append(notification)
+        self.notifications[id(notification)] = notification
         
-        # Nastavení pozice
-        self._position_notifications()
+        # Nastavení pozice – skrytý widget se umístí hned (před show(), aby se neobjevil
+        # na staré pozici); viditelný se přemístí jednou za cyklus událostí
+        if self.isVisible():
+            self._schedule_reposition()
+        else:
+            self.adjustSize()
+            self._position_notifications()
         
         # Zobrazení
         self.show()
         
-        # Animace zobrazení
-        self._animate_notification_in(notification)
+        # Animace zobrazení (při návalu se notifikace zobrazí rovnou)
+        now = time.monotonic()
+        skip_animation = self._skip_animation(now - self._last_show)
+        self._last_show = now
+        if skip_animation:
+            notification.graphicsEffect().setOpacity(1.0)
+        else:
+            self._animate_notification_in(notification)
         
         # Automatické skrytí po timeoutu
         if timeout > 0:
-            QTimer.singleShot(timeout, lambda: self._remove_notification(notification))
+            expire_at = time.monotonic() * 1000 + timeout
+            heapq.heappush(self._expiry_heap, (expire_at, id(notification), notification))
+            if self._expiry_heap[0][2] is notification:
+                self._schedule_expiry()
+    
+    def _schedule_expiry(self):
+        """Nastaví časovač na nejbližší vypršení v haldě"""
+        if not self._expiry_heap:
+            self._expiry_timer.stop()
+            return
+        delay = self._expiry_heap[0][0] - time.monotonic() * 1000
+        self._expiry_timer.start(max(0, int(delay)))
+        
+    def _expire_due(self):
+        """Skryje všechny notifikace, kterým vypršel čas"""
+        now = time.monotonic() * 1000
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, _, notification = heapq.heappop(self._expiry_heap)
+            self._remove_notification(notification)
+        self._schedule_expiry()
     
     def _create_notification_widget(self, message, notification_type):
         """Vytvoří widget pro notifikaci"""
         notification = QWidget(self.notification_container)
         notification.setObjectName("notification")
         
-        # Nastavení stylu podle typu
-        if notification_type == self.INFO:
-            bg_color = "#2196F3"
-            icon = "ℹ️"
-        elif notification_type == self.WARNING:
-            bg_color = "#FF9800"
-            icon = "⚠️"
-        else:  # ERROR
-            bg_color = "#F44336"
-            icon = "❌"
-            
-        notification.setStyleSheet(f"""
-            QWidget#notification {{
-                background-color: {bg_color};
-                border-radius: 6px;
-                color: white;
-            }}
-            QLabel {{
-                color: white;
-            }}
-            QPushButton {{
-                background-color: transparent;
-                color: white;
-                border: none;
-                font-weight: bold;
-                padding: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 255, 255, 0.2);
-                border-radius: 4px;
-            }}
-        """)
+        # Nastavení stylu podle typu (předpřipravené řetězce)
+        if notification_type not in self._STYLES:
+            notification_type = self.ERROR
+        notification.setStyleSheet(self._STYLES[notification_type])
+        icon = self._ICONS[notification_type]
         
         # Vytvoření layoutu notifikace
         layout = QHBoxLayout(notification)
@@ -101,7 +174,7 @@ class NotificationComponent(QWidget):
         
         # Ikona
         icon_label = QLabel(icon)
-        icon_label.setFont(QFont("Segoe UI", 14))
+        icon_label.setFont(self._icon_font())
         layout.addWidget(icon_label)
         
         # Zpráva
@@ -111,83 +184,133 @@ class NotificationComponent(QWidget):
         
         # Tlačítko zavřít
         close_button = QPushButton("×")
-        close_button.setFont(QFont("Segoe UI", 14))
-        close_button.clicked.connect(lambda: self._remove_notification(notification))
+        close_button.setFont(self._icon_font())
+        close_button.setProperty("notification_id", id(notification))
+        close_button.clicked.connect(self._on_close_clicked)
         layout.addWidget(close_button)
         
         # Nastavení fixní šířky a minimální výšky
         notification.setFixedWidth(300)
         notification.setMinimumHeight(50)
         
+        # Průhlednost pro animace – widget zůstává na místě a mění se jen krytí,
+        # takže animace nevyvolává přepočet layoutu kontejneru
+        opacity_effect = QGraphicsOpacityEffect(notification)
+        opacity_effect.setOpacity(0.0)
+        notification.setGraphicsEffect(opacity_effect)
+        
         return notification
     
+    @classmethod
+    def _icon_font(cls):
+        """Vrátí sdílený font pro ikonu a tlačítko zavřít"""
+        if cls._ICON_FONT is None:
+            cls._ICON_FONT = QFont("Segoe UI", 14)
+        return cls._ICON_FONT
+    
+    def _schedule_reposition(self):
+        """Naplánuje přemístění na konec aktuálního cyklu událostí (jen jednou za cyklus)"""
+        if not self._reposition_scheduled:
+            self._reposition_scheduled = True
+            QTimer.singleShot(0, self._flush_reposition)
+            
+    def _flush_reposition(self):
+        """Provede naplánované přemístění"""
+        self._reposition_scheduled = False
+        self._position_notifications()
+        
     def _position_notifications(self):
         """Umístí notifikace na správnou pozici"""
         if not self.parent:
             return
             
         # Umístění v pravém horním rohu rodičovského widgetu
-        parent_rect = self.parent.geometry()
-        self.move(parent_rect.right() - self.width() - 20, parent_rect.top() + 40)
-        
-    def _animate_notification_in(self, notification):
-        """Animuje zobrazení notifikace"""
-        animation = QPropertyAnimation(notification, b"pos")
-        animation.setDuration(300)
+        width = self.width()
+        if self._cached_target_pos is None or self._cached_width != width:
+            parent_rect = self.parent.geometry()
+            self._cached_target_pos = QPoint(parent_rect.right() - width - 20, parent_rect.top() + 40)
+            self._cached_width = width
+        self.move(self._cached_target_pos)
         
-        # Počáteční pozice (mimo obrazovku vpravo)
-        start_pos = QPoint(notification.width(), notification.pos().y())
-        notification.move(start_pos)
+    def eventFilter(self, obj, event):
+        """Zneplatní uloženou pozici při změně geometrie rodiče"""
+        if obj is self.parent and event.type() in (QEvent.Resize, QEvent.Move):
+            self._cached_target_pos = None
+        return super().eventFilter(obj, event)
         
-        # Cílová pozice
-        end_pos = QPoint(0, notification.pos().y())
-        
-        animation.setStartValue(start_pos)
-        animation.setEndValue(end_pos)
-        animation.setEasingCurve(QEasingCurve.OutCubic)
-        
-        # Zajistíme, aby animace nebyla garbage collectována a odstraníme ji po skončení
-        animation.finished.connect(lambda: self._remove_animation(animation))
-        self.active_animations.append(animation)
-        animation.start()
+    def _animate_notification_in(self, notification):
+        """Animuje zobrazení notifikace (postupné zviditelnění)"""
+        self._start_fade(notification, 0.0, 1.0, False)
         
     def _animate_notification_out(self, notification):
-        """Animuje skrytí notifikace"""
-        animation = QPropertyAnimation(notification, b"pos")
-        animation.setDuration(300)
+        """Animuje skrytí notifikace (postupné zprůhlednění)"""
+        self._start_fade(notification, notification.graphicsEffect().opacity(), 0.0, True)
         
-        # Počáteční pozice
-        start_pos = notification.pos()
+    def _start_fade(self, notification, start, end, remove):
+        """Zařadí notifikaci do společné časové osy animací
         
-        # Cílová pozice (mimo obrazovku vpravo)
-        end_pos = QPoint(notification.width(), notification.pos().y())
-        
-        animation.setStartValue(start_pos)
-        animation.setEndValue(end_pos)
-        animation.setEasingCurve(QEasingCurve.OutCubic)
+        Nová animace stejné notifikace nahradí předchozí (např. skrytí během zobrazování).
+        Po dokončení animace s remove=True se notifikace odstraní.
+        """
+        self._animating[id(notification)] = (notification, start, end, time.monotonic(), remove)
+        if self._timeline.state() != QAbstractAnimation.Running:
+            self._timeline.start()
+            
+    def _apply_progress(self, _value=None):
+        """Nastaví průhlednost všem animovaným notifikacím podle uplynulého času"""
+        now = time.monotonic()
+        finished = []
+        for key, (notification, start, end, started_at, remove) in self._animating.items():
+            progress = min(1.0, (now - started_at) / self._FADE_DURATION)
+            eased = self._easing.valueForProgress(progress)
+            notification.graphicsEffect().setOpacity(start + (end - start) * eased)
+            if progress >= 1.0:
+                finished.append(key)
+                
+        for key in finished:
+            notification, _, _, _, remove = self._animating.pop(key)
+            if remove:
+                self._finalize_notification_removal(notification)
+                
+        # Časová osa běží jen dokud je co animovat
+        if not self._animating:
+            self._timeline.stop()
         
-        # Po dokončení animace odstranit widget a odstranit animaci ze seznamu
-        animation.finished.connect(lambda: self._finalize_notification_removal(notification))
-        animation.finished.connect(lambda: self._remove_animation(animation))
-        self.active_animations.append(animation)
-        animation.start()
+    def _on_close_clicked(self):
+        """Zavře notifikaci, ke které patří stisknuté tlačítko"""
+        notification = self.notifications.get(self.sender().property("notification_id"))
+        if notification is not None:
+            self._remove_notification(notification)
         
     def _remove_notification(self, notification):
         """Odstraní notifikaci s animací"""
-        if notification in self.notifications:
-            self._animate_notification_out(notification)
-    
-    def _remove_animation(self, animation):
-        """Odstraní animaci z aktivních animací"""
-        if animation in self.active_animations:
-            self.active_animations.remove(animation)
+        if id(notification) in self.notifications:
+            now = time.monotonic()
+            skip_animation = self._skip_animation(now - self._last_remove)
+            self._last_remove = now
+            if skip_animation:
+                self._finalize_notification_removal(notification)
+            else:
+                self._animate_notification_out(notification)
+                
+    def _skip_animation(self, elapsed):
+        """Zjistí, zda animaci vynechat (elapsed = sekundy od předchozí stejné události)"""
+        return elapsed < self._BURST_INTERVAL or len(self.notifications) > self._ANIMATION_LIMIT
     
     def _finalize_notification_removal(self, notification):
         """Dokončí odstranění notifikace po animaci"""
-        if notification in self.notifications:
-            self.notifications.remove(notification)
-            self.notification_layout.removeWidget(notification)
+        self._animating.pop(id(notification), None)
+        if self.notifications.pop(id(notification), None) is not None:
+            # Odebrání z layoutu s vypnutým překreslováním – jeden přepočet a jedno překreslení
+            container = self.notification_container
+            container.setUpdatesEnabled(False)
+            index = self.notification_layout.indexOf(notification)
+            if index >= 0:
+                self.notification_layout.takeAt(index)
+            notification.setParent(None)
             notification.deleteLater()
+            container.setUpdatesEnabled(True)
+            container.update()
             
             # Pokud nejsou žádné notifikace, skrýt celý widget
             if not self.notifications:
@@ -1,5 +1,5 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
-from PySide6.QtCore import Qt, Signal, QObject
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QListView, QLabel
+from PySide6.QtCore import Qt, Signal, QObject, QTimer
 from PySide6.QtGui import QFont
 
 class PluginPanelComponent(QWidget):
@@ -8,6 +8,8 @@ class PluginPanelComponent(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.plugins = []
+        self._all_items = []
         self._init_ui()
         
     def _init_ui(self):
@@ -24,12 +26,24 @@ class PluginPanelComponent(QWidget):
         # Search field
         self.search_edit = QLineEdit(self)
         self.search_edit.setPlaceholderText("Vyhledat plugin...")
-        self.search_edit.textChanged.connect(self._filter_plugins)
+        self.search_edit.textChanged.connect(self._schedule_filter)
         layout.addWidget(self.search_edit)
         
+        # Debounce timer - a burst of keystrokes results in one filter pass
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(120)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        
         # Plugin list
         self.plugin_list = QListWidget(self)
         self.plugin_list.setFont(QFont("Segoe UI", 12))
+        # Single-line items with a fixed font have the same height - no per-item measuring,
+        # layout of long lists is done in batches
+        self.plugin_list.setViewMode(QListView.ListMode)
+        self.plugin_list.setUniformItemSizes(True)
+        self.plugin_list.setLayoutMode(QListView.Batched)
+        self.plugin_list.setBatchSize(100)
         self.plugin_list.currentRowChanged.connect(self._on_plugin_selected)
         layout.addWidget(self.plugin_list)
         
@@ -39,26 +53,47 @@ class PluginPanelComponent(QWidget):
     def add_plugins(self, plugins):
         """Add plugins to the list widget"""
         self.plugins = plugins
-        self.plugin_list.clear()
-        
-        for plugin in plugins:
-            item = QListWidgetItem(plugin.name())
-            item.setData(Qt.UserRole, plugin)
-            self.plugin_list.addItem(item)
+        # Cache (name lowercase, name, index in plugins, plugin) - names are computed once here,
+        # the filter only compares and rebuilds the list from this cache
+        self._all_items = []
+        for index, plugin in enumerate(plugins):
+            name = plugin.name()
+            self._all_items.append((name.lower(), name, index, plugin))
+        self._filter_plugins(self.search_edit.text())
+    
+    def _schedule_filter(self, *_):
+        """Restart the debounce timer on every change of the search text"""
+        self._filter_timer.start()
+    
+    def _apply_filter(self):
+        """Run the filter with the current search text"""
+        self._filter_plugins(self.search_edit.text())
     
     def _filter_plugins(self, text):
         """Filter plugins based on search text"""
-        for index in range(self.plugin_list.count()):
-            item = self.plugin_list.item(index)
-            if text.lower() in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        # Rebuilding the list is cheaper than calling setHidden on every item
+        needle = text.lower()
+        current = self.plugin_list.currentItem()
+        current_index = current.data(Qt.UserRole + 1) if current is not None else None
+        self.plugin_list.setUpdatesEnabled(False)
+        self.plugin_list.blockSignals(True)
+        self.plugin_list.clear()
+        for name_lc, name, plugin_index, plugin in self._all_items:
+            if name_lc.find(needle) != -1:
+                item = QListWidgetItem(name)
+                item.setData(Qt.UserRole, plugin)
+                item.setData(Qt.UserRole + 1, plugin_index)
+                self.plugin_list.addItem(item)
+                if plugin_index == current_index:
+                    self.plugin_list.setCurrentItem(item)
+        self.plugin_list.blockSignals(False)
+        self.plugin_list.setUpdatesEnabled(True)
     
     def _on_plugin_selected(self, index):
         """Handle plugin selection"""
         if index < 0 or index >= self.plugin_list.count():
             return
             
-        plugin = self.plugin_list.item(index).data(Qt.UserRole)
-        self.plugin_selected.emit(index, plugin)
\ No newline at end of file
+        item = self.plugin_list.item(index)
+        # Emit the index in self.plugins, rows shift when the list is filtered
+        self.plugin_selected.emit(item.data(Qt.UserRole + 1), item.data(Qt.UserRole))
\ No newline at end of file
@@ -4,6 +4,29 @@ from PySide6.QtWidgets import (QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabe
 from PySide6.QtCore import Qt, Signal, QSettings, QObject
 from PySide6.QtGui import QFont, QIcon
 
+def _convert_value(value, value_type):
+    """Převede uloženou hodnotu na požadovaný typ (obdobně jako QSettings.value(type=...))"""
+    if value_type is None or isinstance(value, value_type):
+        return value
+    if value_type is bool and isinstance(value, str):
+        # INI/registry backend vrací bool jako text
+        return value.lower() in ("true", "1")
+    try:
+        return value_type(value)
+    except (TypeError, ValueError):
+        return value
+
+# Nastavení upravovaná v dialogu: (klíč, výchozí hodnota, typ)
+_DIALOG_SETTINGS = (
+    ("general/language", "cs", str),
+    ("general/theme", "light", str),
+    ("general/autosave", True, bool),
+    ("general/autosave_interval", 5, int),
+    ("export/default_format", "png", str),
+    ("export/default_quality", 90, int),
+    ("export/default_path", "", str),
+)
+
 class SettingsComponent(QObject):
     """Komponenta pro správu nastavení aplikace"""
     
@@ -14,8 +37,12 @@ class SettingsComponent(QObject):
         super().__init__(parent)
         self.parent = parent
         self.settings = QSettings("OrtoPokrokove", "Aplikace")
+        self._dialog = None
         self._load_default_settings()
         
+        # Paměťová cache hodnot - čtení nešahá na QSettings (registry/INI)
+        self._cache = {key: self.settings.value(key) for key in self.settings.allKeys()}
+        
     def _load_default_settings(self):
         """Načte výchozí nastavení, pokud neexistují"""
         # Obecná nastavení
@@ -50,24 +77,61 @@ class SettingsComponent(QObject):
             default: Výchozí hodnota, pokud nastavení neexistuje
             value_type: Typ hodnoty (bool, int, str, atd.)
         """
-        if value_type is not None:
-            return self.settings.value(key, default, type=value_type)
-        return self.settings.value(key, default)
+        if key not in self._cache:
+            return default
+        value = self._cache[key]
+        if value is None:
+            return default
+        return _convert_value(value, value_type)
         
     def set_setting(self, key, value):
         """Nastaví hodnotu nastavení"""
         self.settings.setValue(key, value)
+        self._cache[key] = value
         
         # Emitovat signál o změně nastavení
         changed_settings = {key: value}
         self.settings_changed.emit(changed_settings)
         
+    def get_many(self, keys, default=None):
+        """Získá více hodnot nastavení najednou
+        
+        Args:
+            keys: Klíče nastavení
+            default: Výchozí hodnota pro chybějící klíče
+            
+        Returns:
+            Slovník klíč -> hodnota
+        """
+        return {key: self.get_setting(key, default) for key in keys}
+        
+    def set_many(self, values):
+        """Nastaví více hodnot najednou, zapíše je na disk jedním sync() a emituje jeden signál
+        
+        Args:
+            values: Slovník klíč -> hodnota
+        """
+        if not values:
+            return
+        for key, value in values.items():
+            self.settings.setValue(key, value)
+            self._cache[key] = value
+        self.settings.sync()
+        
+        self.settings_changed.emit(dict(values))
+        
     def show_settings_dialog(self):
         """Zobrazí dialog nastavení"""
-        dialog = SettingsDialog(self.parent, self.settings)
+        # Dialog se vytváří jen jednou, při dalším otevření se jen obnoví hodnoty
+        if self._dialog is None:
+            self._dialog = SettingsDialog(self.parent, self.settings)
+        else:
+            self._dialog.reload_from_settings()
+        dialog = self._dialog
         if dialog.exec() == QDialog.Accepted:
             # Uložit změny a emitovat signál
             changed_settings = dialog.get_changed_settings()
+            self._cache.update(changed_settings)
             if changed_settings:
                 self.settings_changed.emit(changed_settings)
                 
@@ -79,6 +143,31 @@ class SettingsDialog(QDialog):
         self.settings = settings
         self.changed_settings = {}
         self._init_ui()
+        self.reload_from_settings()
+        
+    def reload_from_settings(self):
+        """Načte aktuální hodnoty z QSettings do widgetů dialogu"""
+        self.changed_settings = {}
+        # Hodnoty načtené jednou při otevření - používají se pro widgety i pro porovnání při uložení
+        self._snapshot = {
+            key: self.settings.value(key, default, type=value_type)
+            for key, default, value_type in _DIALOG_SETTINGS
+        }
+        snapshot = self._snapshot
+        
+        current_lang = snapshot["general/language"]
+        self.language_combo.setCurrentIndex(0 if current_lang == "cs" else 1)
+        current_theme = snapshot["general/theme"]
+        self.theme_combo.setCurrentIndex(0 if current_theme == "light" else 1 if current_theme == "dark" else 2)
+        self.autosave_check.setChecked(snapshot["general/autosave"])
+        self.autosave_interval.setValue(snapshot["general/autosave_interval"])
+        
+        current_format = snapshot["export/default_format"]
+        self.export_format.setCurrentIndex(0 if current_format == "png" else 1 if current_format == "jpg" else 2)
+        self.export_quality.setValue(snapshot["export/default_quality"])
+        self.export_path.setText(snapshot["export/default_path"])
+        
+        self.tab_widget.setCurrentIndex(0)
         
     def _init_ui(self):
         # Nastavení dialogu
@@ -104,8 +193,6 @@ class SettingsDialog(QDialog):
         self.language_combo = QComboBox()
         self.language_combo.addItem("Čeština", "cs")
         self.language_combo.addItem("English", "en")
-        current_lang = self.settings.value("general/language", "cs")
-        self.language_combo.setCurrentIndex(0 if current_lang == "cs" else 1)
         appearance_layout.addRow("Jazyk:", self.language_combo)
         
         # Výběr tématu
@@ -113,8 +200,6 @@ class SettingsDialog(QDialog):
         self.theme_combo.addItem("Světlé téma", "light")
         self.theme_combo.addItem("Tmavé téma", "dark")
         self.theme_combo.addItem("Systémové téma", "system")
-        current_theme = self.settings.value("general/theme", "light")
-        self.theme_combo.setCurrentIndex(0 if current_theme == "light" else 1 if current_theme == "dark" else 2)
         appearance_layout.addRow("Téma:", self.theme_combo)
         
         general_layout.addWidget(appearance_group)
@@ -125,13 +210,11 @@ class SettingsDialog(QDialog):
         
         # Zapnutí automatického ukládání
         self.autosave_check = QCheckBox()
-        self.autosave_check.setChecked(self.settings.value("general/autosave", True, type=bool))
         autosave_layout.addRow("Povolit automatické ukládání:", self.autosave_check)
         
         # Interval automatického ukládání
         self.autosave_interval = QSpinBox()
         self.autosave_interval.setRange(1, 60)
-        self.autosave_interval.setValue(self.settings.value("general/autosave_interval", 5, type=int))
         self.autosave_interval.setSuffix(" min")
         autosave_layout.addRow("Interval ukládání:", self.autosave_interval)
         
@@ -151,20 +234,16 @@ class SettingsDialog(QDialog):
         self.export_format.addItem("PNG (.png)", "png")
         self.export_format.addItem("JPEG (.jpg)", "jpg")
         self.export_format.addItem("TIFF (.tiff)", "tiff")
-        current_format = self.settings.value("export/default_format", "png")
-        self.export_format.setCurrentIndex(0 if current_format == "png" else 1 if current_format == "jpg" else 2)
         export_form.addRow("Výchozí formát:", self.export_format)
         
         # Kvalita exportu
         self.export_quality = QSpinBox()
         self.export_quality.setRange(1, 100)
-        self.export_quality.setValue(self.settings.value("export/default_quality", 90, type=int))
         self.export_quality.setSuffix(" %")
         export_form.addRow("Kvalita exportu:", self.export_quality)
         
         # Výchozí cesta
         self.export_path = QLineEdit()
-        self.export_path.setText(self.settings.value("export/default_path", ""))
         self.export_path.setPlaceholderText("Výchozí složka pro export")
         export_form.addRow("Výchozí cesta:", self.export_path)
         
@@ -177,6 +256,17 @@ class SettingsDialog(QDialog):
         
         layout.addWidget(self.tab_widget)
         
+        # Vazby klíč nastavení -> getter hodnoty z widgetu
+        self._bindings = (
+            ("general/language", self.language_combo.currentData),
+            ("general/theme", self.theme_combo.currentData),
+            ("general/autosave", self.autosave_check.isChecked),
+            ("general/autosave_interval", self.autosave_interval.value),
+            ("export/default_format", self.export_format.currentData),
+            ("export/default_quality", self.export_quality.value),
+            ("export/default_path", self.export_path.text),
+        )
+        
         # Tlačítka
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self._save_settings)
@@ -185,42 +275,15 @@ class SettingsDialog(QDialog):
         
     def _save_settings(self):
         """Uloží změněná nastavení"""
-        # Obecná nastavení
-        new_lang = self.language_combo.currentData()
-        if new_lang != self.settings.value("general/language"):
-            self.settings.setValue("general/language", new_lang)
-            self.changed_settings["general/language"] = new_lang
-            
-        new_theme = self.theme_combo.currentData()
-        if new_theme != self.settings.value("general/theme"):
-            self.settings.setValue("general/theme", new_theme)
-            self.changed_settings["general/theme"] = new_theme
-            
-        new_autosave = self.autosave_check.isChecked()
-        if new_autosave != self.settings.value("general/autosave", True, type=bool):
-            self.settings.setValue("general/autosave", new_autosave)
-            self.changed_settings["general/autosave"] = new_autosave
-            
-        new_interval = self.autosave_interval.value()
-        if new_interval != self.settings.value("general/autosave_interval", 5, type=int):
-            self.settings.setValue("general/autosave_interval", new_interval)
-            self.changed_settings["general/autosave_interval"] = new_interval
-            
-        # Nastavení exportu
-        new_format = self.export_format.currentData()
-        if new_format != self.settings.value("export/default_format"):
-            self.settings.setValue("export/default_format", new_format)
-            self.changed_settings["export/default_format"] = new_format
-            
-        new_quality = self.export_quality.value()
-        if new_quality != self.settings.value("export/default_quality", 90, type=int):
-            self.settings.setValue("export/default_quality", new_quality)
-            self.changed_settings["export/default_quality"] = new_quality
-            
-        new_path = self.export_path.text()
-        if new_path != self.settings.value("export/default_path", ""):
-            self.settings.setValue("export/default_path", new_path)
-            self.changed_settings["export/default_path"] = new_path
+        for key, getter in self._bindings:
+            new_value = getter()
+            if new_value != self._snapshot[key]:
+                self.settings.setValue(key, new_value)
+                self.changed_settings[key] = new_value
+                
+        # Jeden zápis na disk pro všechny změny
+        if self.changed_settings:
+            self.settings.sync()
             
         self.accept()
         
@@ -1,6 +1,13 @@
 from PySide6.QtWidgets import QStatusBar, QProgressBar, QLabel, QHBoxLayout, QWidget
 from PySide6.QtCore import Qt, QTimer, Signal, QObject
 
+# Barvy stavového textu podle úrovně – stylesheet se nastaví jednou a úroveň se
+# přepíná dynamickou vlastností "level" (bez opakovaného parsování QSS)
+_STATUS_LABEL_QSS = """
+    QLabel[level="1"] { color: #FF9800; }
+    QLabel[level="2"] { color: #F44336; }
+"""
+
 class StatusPanelComponent(QObject):
     """Pokročilý stavový panel s indikátorem průběhu a systémem notifikací"""
     
@@ -32,6 +39,8 @@ class StatusPanelComponent(QObject):
         
         # Přidání stavového textu
         self.status_label = QLabel("Připraveno")
+        self.status_label.setProperty("level", 0)
+        self.status_label.setStyleSheet(_STATUS_LABEL_QSS)
         status_layout.addWidget(self.status_label, 1)
         
         # Přidání informace o verzi
@@ -50,16 +59,28 @@ class StatusPanelComponent(QObject):
     def show_message(self, message, timeout=3000):
         """Zobrazí zprávu ve stavovém řádku"""
         self.status_label.setText(message)
+        self._set_level(0)
         self.notification_shown.emit(message, 0)
         
         # Automatické vyčištění po timeoutu
         if timeout > 0:
             self.notification_timer.start(timeout)
             
+    def show_messages(self, messages, timeout=3000):
+        """Zobrazí dávku zpráv najednou
+        
+        Zobrazí se a signálem se ohlásí pouze poslední zpráva, mezilehlé zprávy
+        se zahodí (stavový řádek stejně ukazuje jen aktuální stav).
+        """
+        messages = list(messages)
+        if not messages:
+            return
+        self.show_message(messages[-1], timeout)
+            
     def show_warning(self, message, timeout=5000):
         """Zobrazí varování ve stavovém řádku"""
         self.status_label.setText("⚠️ " + message)
-        self.status_label.setStyleSheet("color: #FF9800;")
+        self._set_level(1)
         self.notification_shown.emit(message, 1)
         
         # Automatické vyčištění po timeoutu
@@ -69,7 +90,7 @@ class StatusPanelComponent(QObject):
     def show_error(self, message, timeout=7000):
         """Zobrazí chybu ve stavovém řádku"""
         self.status_label.setText("❌ " + message)
-        self.status_label.setStyleSheet("color: #F44336;")
+        self._set_level(2)
         self.notification_shown.emit(message, 2)
         
         # Automatické vyčištění po timeoutu
@@ -79,7 +100,16 @@ class StatusPanelComponent(QObject):
     def _clear_notification(self):
         """Vyčistí notifikaci a vrátí výchozí styl"""
         self.status_label.setText("Připraveno")
-        self.status_label.setStyleSheet("")
+        self._set_level(0)
+        
+    def _set_level(self, level):
+        """Přepne barvu stavového textu (0=info, 1=varování, 2=chyba)"""
+        if self.status_label.property("level") == level:
+            return
+        self.status_label.setProperty("level", level)
+        style = self.status_label.style()
+        style.unpolish(self.status_label)
+        style.polish(self.status_label)
         
     def show_progress(self, value=None):
         """Zobrazí nebo aktualizuje indikátor průběhu"""
@@ -1,5 +1,19 @@
+import os
+from functools import lru_cache
+
 from PySide6.QtCore import QObject, Signal
 
+# Stylesheets live in themes/<name>.qss and are read only when first applied,
+# so a session that never toggles the theme never loads the other one
+_THEMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes")
+_THEME_FILES = {True: "light.qss", False: "dark.qss"}
+
+@lru_cache(maxsize=2)
+def _load_theme(light):
+    """Read the stylesheet of the light or dark theme (cached after the first read)"""
+    with open(os.path.join(_THEMES_DIR, _THEME_FILES[light]), encoding="utf-8") as f:
+        return f.read()
+
 class ThemeManager(QObject):
     # Signal emitted when theme changes (True = light, False = dark)
     theme_changed = Signal(bool)
@@ -8,6 +22,7 @@ class ThemeManager(QObject):
         super().__init__(parent)
         self.parent = parent
         self._is_light_theme = True
+        self._applied = False
     
     @property
     def is_light_theme(self):
@@ -20,269 +35,20 @@ class ThemeManager(QObject):
         
     def apply_theme(self, light=True):
         """Apply light or dark theme to the application"""
+        light = bool(light)
+        # Re-applying the active stylesheet would only repolish every widget
+        if self._applied and light == self._is_light_theme:
+            return
         self.is_light_theme = light
-        
-        if light:
-            self.parent.setStyleSheet("""
-                QMainWindow { background-color: #f9f9f9; }
-                QListWidget { 
-                    background: #ffffff; 
-                    border: 1px solid #cccccc; 
-                    font-size: 16px; 
-                    padding: 5px;
-                    border-radius: 4px;
-                }
-                QListWidget::item { 
-                    padding: 8px;
-                    margin: 2px 0;
-                    border-radius: 4px;
-                }
-                QListWidget::item:selected { 
-                    background: #e0f0ff; 
-                    color: #0066cc;
-                }
-                QListWidget::item:hover { 
-                    background: #f0f0f0; 
-                }
-                QStackedWidget { 
-                    background: #ffffff; 
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                }
-                QToolBar { 
-                    background: #eaeaea; 
-                    border-bottom: 1px solid #cccccc;
-                    spacing: 5px;
-                }
-                QToolButton {
-                    background: #f5f5f5;
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                    padding: 4px;
-                }
-                QToolButton:hover {
-                    background: #e0e0e0;
-                }
-                QLineEdit { 
-                    background: #ffffff; 
-                    border: 1px solid #cccccc; 
-                    padding: 8px;
-                    border-radius: 4px;
-                }
-                QStatusBar { 
-                    background: #eaeaea; 
-                    border-top: 1px solid #cccccc;
-                }
-                QSplitter::handle {
-                    background: #cccccc;
-                }
-                QScrollBar {
-                    background: #f0f0f0;
-                    width: 12px;
-                }
-                QScrollBar::handle {
-                    background: #cccccc;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:hover {
-                    background: #aaaaaa;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                }
-                QTabBar::tab {
-                    background: #f0f0f0;
-                    border: 1px solid #cccccc;
-                    border-bottom-color: #cccccc;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    padding: 6px 10px;
-                }
-                QTabBar::tab:selected {
-                    background: #ffffff;
-                    border-bottom-color: #ffffff;
-                }
-                QTabBar::tab:hover {
-                    background: #e0e0e0;
-                }
-                QPushButton {
-                    background: #f5f5f5;
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background: #e0e0e0;
-                }
-                QPushButton:pressed {
-                    background: #d0d0d0;
-                }
-                QComboBox {
-                    background: #ffffff;
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                }
-                QComboBox:hover {
-                    border-color: #aaaaaa;
-                }
-                QComboBox::drop-down {
-                    subcontrol-origin: padding;
-                    subcontrol-position: top right;
-                    width: 20px;
-                    border-left: 1px solid #cccccc;
-                }
-            """)
-        else:
-            self.parent.setStyleSheet("""
-                QMainWindow { 
-                    background-color: #2b2b2b; 
-                    color: #e0e0e0; 
-                }
-                QListWidget { 
-                    background: #3c3f41; 
-                    border: 1px solid #555555; 
-                    color: #e0e0e0; 
-                    font-size: 16px; 
-                    padding: 5px;
-                    border-radius: 4px;
-                }
-                QListWidget::item { 
-                    padding: 8px;
-                    margin: 2px 0;
-                    border-radius: 4px;
-                }
-                QListWidget::item:selected { 
-                    background: #2d5a88; 
-                    color: #ffffff;
-                }
-                QListWidget::item:hover { 
-                    background: #4c4c4c; 
-                }
-                QStackedWidget { 
-                    background: #3c3f41; 
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                }
-                QToolBar { 
-                    background: #3c3f41; 
-                    border-bottom: 1px solid #555555;
-                    spacing: 5px;
-                }
-                QToolButton {
-                    background: #4c4c4c;
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                    padding: 4px;
-                    color: #e0e0e0;
-                }
-                QToolButton:hover {
-                    background: #5a5a5a;
-                }
-                QLineEdit { 
-                    background: #555555; 
-                    border: 1px solid #777777; 
-                    padding: 8px;
-                    color: #e0e0e0;
-                    border-radius: 4px;
-                }
-                QStatusBar { 
-                    background: #3c3f41; 
-                    border-top: 1px solid #555555;
-                    color: #e0e0e0;
-                }
-                QSplitter::handle {
-                    background: #555555;
-                }
-                QScrollBar {
-                    background: #3c3f41;
-                    width: 12px;
-                }
-                QScrollBar::handle {
-                    background: #555555;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:hover {
-                    background: #777777;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                }
-                QTabBar::tab {
-                    background: #3c3f41;
-                    border: 1px solid #555555;
-                    border-bottom-color: #555555;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    padding: 6px 10px;
-                    color: #e0e0e0;
-                }
-                QTabBar::tab:selected {
-                    background: #4c4c4c;
-                    border-bottom-color: #4c4c4c;
-                }
-                QTabBar::tab:hover {
-                    background: #5a5a5a;
-                }
-                QPushButton {
-                    background: #4c4c4c;
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    color: #e0e0e0;
-                }
-                QPushButton:hover {
-                    background: #5a5a5a;
-                }
-                QPushButton:pressed {
-                    background: #666666;
-                }
-                QComboBox {
-                    background: #4c4c4c;
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                    color: #e0e0e0;
-                }
-                QComboBox:hover {
-                    border-color: #777777;
-                }
-                QComboBox::drop-down {
-                    subcontrol-origin: padding;
-                    subcontrol-position: top right;
-                    width: 20px;
-                    border-left: 1px solid #555555;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-                QCheckBox {
-                    color: #e0e0e0;
-                }
-                QRadioButton {
-                    color: #e0e0e0;
-                }
-                QSpinBox {
-                    background: #4c4c4c;
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                    padding: 4px;
-                    color: #e0e0e0;
-                }
-                QGroupBox {
-                    color: #e0e0e0;
-                    border: 1px solid #555555;
-                    border-radius: 4px;
-                    margin-top: 1ex;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    subcontrol-position: top left;
-                    padding: 0 3px;
-                }
-            """)
+        # Repaints caused by repolishing all widgets are coalesced into one update
+        parent = self.parent
+        parent.setUpdatesEnabled(False)
+        try:
+            parent.setStyleSheet(_load_theme(light))
+        finally:
+            parent.setUpdatesEnabled(True)
+            parent.update()
+        self._applied = True
     
     def toggle_theme(self):
         """Toggle between light and dark themes"""
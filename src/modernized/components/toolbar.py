@@ -2,6 +2,26 @@ from PySide6.QtWidgets import QToolBar, QToolButton, QMenu
 from PySide6.QtCore import Signal, QObject, Qt, QSize
 from PySide6.QtGui import QIcon, QAction
 
+# Theme toggle labels - the action offers the other theme than the active one
+_DARK_LABEL = "Přepnout tmavý režim"
+_LIGHT_LABEL = "Přepnout světlý režim"
+
+# Export menu entries: (label, objectName)
+_EXPORT_ACTIONS = (
+    ("Export jako PNG", "actionExportPNG"),
+    ("Export jako JPEG", "actionExportJPEG"),
+    ("Export jako TIFF", "actionExportTIFF"),
+)
+
+def _build_export_menu(parent):
+    """Build the export dropdown menu with its actions"""
+    menu = QMenu(parent)
+    menu.setObjectName("exportMenu")
+    for label, object_name in _EXPORT_ACTIONS:
+        action = menu.addAction(label)
+        action.setObjectName(object_name)
+    return menu
+
 class ToolbarComponent(QObject):
     # Signals
     theme_toggle_requested = Signal()
@@ -20,7 +40,7 @@ class ToolbarComponent(QObject):
         self.toolbar.setIconSize(new_size)
         
         # Theme toggle action
-        self.action_toggle_theme = QAction("Přepnout tmavý režim", self.parent)
+        self.action_toggle_theme = QAction(_DARK_LABEL, self.parent)
         self.action_toggle_theme.setObjectName("actionToggleTheme")
         self.action_toggle_theme.triggered.connect(self.theme_toggle_requested.emit)
         self.toolbar.addAction(self.action_toggle_theme)
@@ -34,20 +54,7 @@ class ToolbarComponent(QObject):
         self.export_button.setText("Export")
         self.export_button.setPopupMode(QToolButton.InstantPopup)
         
-        export_menu = QMenu(self.parent)
-        export_menu.setObjectName("exportMenu")
-        
-        export_png_action = QAction("Export jako PNG", self.parent)
-        export_png_action.setObjectName("actionExportPNG")
-        export_menu.addAction(export_png_action)
-        
-        export_jpg_action = QAction("Export jako JPEG", self.parent)
-        export_jpg_action.setObjectName("actionExportJPEG")
-        export_menu.addAction(export_jpg_action)
-        
-        export_tiff_action = QAction("Export jako TIFF", self.parent)
-        export_tiff_action.setObjectName("actionExportTIFF")
-        export_menu.addAction(export_tiff_action)
+        export_menu = _build_export_menu(self.parent)
         self.export_button.setMenu(export_menu)
         
         self.toolbar.addWidget(self.export_button)
@@ -59,7 +66,4 @@ class ToolbarComponent(QObject):
         
     def update_theme_action_text(self, is_light_theme):
         """Update the text of the theme toggle action based on current theme"""
-        if is_light_theme:
-            self.action_toggle_theme.setText("Přepnout tmavý režim")
-        else:
-            self.action_toggle_theme.setText("Přepnout světlý režim")
+        self.action_toggle_theme.setText(_DARK_LABEL if is_light_theme else _LIGHT_LABEL)
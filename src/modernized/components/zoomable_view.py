@@ -1,8 +1,12 @@
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene
 from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPainter, QWheelEvent
+from PySide6.QtGui import QPainter, QWheelEvent, QBrush, QColor
 
 class ZoomableGraphicsView(QGraphicsView):
+    # Scale factors of one wheel step
+    _ZOOM_IN = 1.25
+    _ZOOM_OUT = 1 / 1.25
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -11,46 +15,44 @@ class ZoomableGraphicsView(QGraphicsView):
         self.setDragMode(QGraphicsView.ScrollHandDrag)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Repaint only the dirty regions, not the whole viewport on every change
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
         
         # Initialize scene
         self.setScene(QGraphicsScene(self))
         
-        # Set background
-        self.setStyleSheet("background-color: #333;")
+        # Set background (a brush instead of a per-widget stylesheet)
+        self.setBackgroundBrush(QBrush(QColor(0x33, 0x33, 0x33)))
+        self.viewport().setAutoFillBackground(True)
         
         # Initialize zoom level
         self._zoom = 0
         self._max_zoom = 20
         self._min_zoom = -10
-        self._zoom_factor_base = 1.25
+        self._zoom_factor_base = self._ZOOM_IN
         
     def wheelEvent(self, event: QWheelEvent):
         """Handle mouse wheel events for zooming"""
-        if event.modifiers() & Qt.ControlModifier:
-            # Zoom with Ctrl+Wheel
-            angle_delta = event.angleDelta().y()
-            
-            if angle_delta > 0:
-                zoom_factor = self._zoom_factor_base
-                self._zoom += 1
-            else:
-                zoom_factor = 1 / self._zoom_factor_base
-                self._zoom -= 1
-                
-            # Limit zoom level
-            if self._zoom < self._min_zoom:
-                self._zoom = self._min_zoom
-                return
-            if self._zoom > self._max_zoom:
-                self._zoom = self._max_zoom
-                return
-                
-            # Apply zoom
-            self.scale(zoom_factor, zoom_factor)
-        else:
+        if not (event.modifiers() & Qt.ControlModifier):
             # Normal scrolling
-            super().wheelEvent(event)
+            return super().wheelEvent(event)
+            
+        # Zoom with Ctrl+Wheel (purely horizontal deltas do not zoom)
+        angle_delta = event.angleDelta().y()
+        if angle_delta == 0:
+            return
+        step = 1 if angle_delta > 0 else -1
+        
+        # Limit zoom level
+        new_zoom = self._zoom + step
+        if new_zoom < self._min_zoom or new_zoom > self._max_zoom:
+            return
+        self._zoom = new_zoom
+        
+        # Apply zoom
+        zoom_factor = self._ZOOM_IN if step > 0 else self._ZOOM_OUT
+        self.scale(zoom_factor, zoom_factor)
             
     def reset_zoom(self):
         """Reset zoom to original level"""
@@ -2,11 +2,10 @@ import sys
 import os
 import logging
 
-# Add parent directory to sys.path for module imports
-current_dir = os.path.abspath(os.path.dirname(__file__))
-parent_dir = os.path.dirname(os.path.dirname(current_dir))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+# Project root (contains the plugins package) - the only place that extends sys.path
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
 
 try:
     from PySide6.QtWidgets import QApplication
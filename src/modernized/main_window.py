@@ -1,7 +1,6 @@
 import os
-import sys
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QSplitter, QMessageBox
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtGui import QAction  # Přidáno QAction pro případné použití
 
 from .components.toolbar import ToolbarComponent
@@ -11,15 +10,18 @@ from .components.theme_manager import ThemeManager
 from .components.status_panel import StatusPanelComponent
 from .components.notification import NotificationComponent
 from .components.settings import SettingsComponent
-from .components.help import HelpComponent
 from .components.keyboard_shortcuts import KeyboardShortcutsComponent
 
-# Pro import z adresáře mimo modernized použijte absolutní import
-current_dir = os.path.abspath(os.path.dirname(__file__))
-parent_dir = os.path.dirname(os.path.dirname(current_dir))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+# Balíček plugins leží v kořeni projektu, který do sys.path přidává main.py
 from plugins.plugin_manager import PluginManager
+# Globální QObject sdílený pluginy se musí vytvořit v hlavním vlákně, proto se
+# importuje tady, a ne až při hledání pluginů na pozadí
+from plugins import signal_manager  # noqa: F401
+
+# Adresář s pluginy (počítá se jednou při importu)
+PLUGIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "plugins"
+)
 
 # Predefined plugin order
 PREDEFINED_ORDER = [
@@ -33,6 +35,26 @@ PREDEFINED_ORDER = [
     "LoggingPlugin"
 ]
 
+class _PluginDiscoverySignals(QObject):
+    """Signály úlohy hledání pluginů (objekt žije v hlavním vlákně)"""
+    finished = Signal(object)  # seznam tříd pluginů
+
+class _PluginDiscoveryTask(QRunnable):
+    """Na pozadí naimportuje moduly pluginů a najde jejich třídy
+    
+    Moduly, které při importu vytváří QObjecty (např. plugins.signal_manager),
+    musí být naimportované předem v hlavním vlákně – jinak by objekt patřil
+    vláknu z poolu bez smyčky událostí.
+    """
+    
+    def __init__(self, plugin_manager):
+        super().__init__()
+        self.plugin_manager = plugin_manager
+        self.signals = _PluginDiscoverySignals()
+        
+    def run(self):
+        self.signals.finished.emit(self.plugin_manager.discover_plugin_classes())
+
 class ModernMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -44,7 +66,10 @@ class ModernMainWindow(QMainWindow):
         self._init_components()
         self._setup_layout()
         self._connect_signals()
-        self._load_plugins()
+        
+        # Pluginy se načítají až po zobrazení okna
+        self._plugin_discovery = None
+        QTimer.singleShot(0, self._load_plugins)
         
         # Načtení uloženého stavu a geometrie okna
         self._restore_window_state()
@@ -84,12 +109,18 @@ class ModernMainWindow(QMainWindow):
         # Systém notifikací
         self.notification = NotificationComponent(self)
         
-        # Komponenta nápovědy
-        self.help_component = HelpComponent(self)
-        
         # Klávesové zkratky
         self.shortcuts_component = KeyboardShortcutsComponent(self)
 
+    @property
+    def help_component(self):
+        """Komponenta nápovědy - vytváří se (včetně importu modulu) až při prvním použití"""
+        component = self.__dict__.get("_help_component")
+        if component is None:
+            from .components.help import HelpComponent
+            component = self._help_component = HelpComponent(self)
+        return component
+        
     def _setup_layout(self):
         """Nastavení layoutu aplikace"""
         # Vytvoření splitteru pro levý a pravý panel
@@ -112,13 +143,15 @@ class ModernMainWindow(QMainWindow):
         
     def _restore_window_state(self):
         """Obnoví uložený stav a geometrii okna"""
+        values = self.settings_component.get_many(("window/geometry", "window/state"))
+        
         # Obnovení geometrie okna
-        geometry = self.settings_component.get_setting("window/geometry")
+        geometry = values["window/geometry"]
         if geometry:
             self.restoreGeometry(geometry)
             
         # Obnovení stavu okna (toolbary, docky, atd.)
-        state = self.settings_component.get_setting("window/state")
+        state = values["window/state"]
         if state:
             self.restoreState(state)
 
@@ -126,15 +159,18 @@ class ModernMainWindow(QMainWindow):
         """Propojení signálů mezi komponentami"""
         # Propojení přepínání témat
         self.toolbar_component.theme_toggle_requested.connect(self.theme_manager.toggle_theme)
-        self.theme_manager.is_light_theme_changed = lambda is_light: self.toolbar_component.update_theme_action_text(is_light)
+        self.theme_manager.theme_changed.connect(
+            self.toolbar_component.update_theme_action_text, Qt.DirectConnection
+        )
         
         # Propojení výběru pluginu
         self.plugin_panel.plugin_selected.connect(self._on_plugin_selected)
         
         # Propojení nápovědy
-        self.toolbar_component.action_help.triggered.connect(lambda: self.help_component.show_help())
+        self.toolbar_component.action_help.triggered.connect(self._show_help)
         
         # Propojení klávesových zkratek
+        self._init_shortcut_table()
         self.shortcuts_component.shortcut_triggered.connect(self._handle_shortcut)
         
         # Propojení notifikací se stavovým panelem
@@ -145,18 +181,21 @@ class ModernMainWindow(QMainWindow):
 
     def _load_plugins(self):
         """Načtení pluginů"""
-        # Získání nadřazeného adresáře pro načtení pluginů
-        current_dir = os.path.abspath(os.path.dirname(__file__))
-        parent_dir = os.path.dirname(os.path.dirname(current_dir))
-        plugin_dir = os.path.join(parent_dir, "plugins")
-        
         # Zobrazení indikátoru průběhu
         self.status_panel.show_progress(None)
         self.status_panel.show_message("Načítání pluginů...")
         
-        # Inicializace správce pluginů
-        self.plugin_manager = PluginManager(plugin_dir)
-        plugins = self.plugin_manager.load_plugins(predefined_order=PREDEFINED_ORDER)
+        # Inicializace správce pluginů, import modulů běží ve vlákně na pozadí
+        self.plugin_manager = PluginManager(PLUGIN_DIR)
+        task = _PluginDiscoveryTask(self.plugin_manager)
+        task.signals.finished.connect(self._attach_plugins)
+        self._plugin_discovery = task.signals
+        QThreadPool.globalInstance().start(task)
+        
+    def _attach_plugins(self, plugin_classes):
+        """Vytvoří nalezené pluginy a přidá je do UI (hlavní vlákno)"""
+        self._plugin_discovery = None
+        plugins = self.plugin_manager.instantiate_plugins(plugin_classes, predefined_order=PREDEFINED_ORDER)
         
         # Přidání pluginů do komponent UI
         self.plugin_panel.add_plugins(plugins)
@@ -171,30 +210,52 @@ class ModernMainWindow(QMainWindow):
         self.content_panel.switch_to_plugin(index)
         self.status_panel.show_message(f"Plugin aktivní: {plugin.name()}")
         
+    def _init_shortcut_table(self):
+        """Sestaví tabulku akce zkratky -> obslužná funkce"""
+        preview_view = self.content_panel.preview_view
+        self._shortcut_table = {
+            "help": self._show_help,
+            "settings": self.settings_component.show_settings_dialog,
+            "quit": self.close,
+            "toggle_theme": self.theme_manager.toggle_theme,
+            "next_plugin": self._next_plugin,
+            "prev_plugin": self._prev_plugin,
+            "zoom_in": self._zoom_in,
+            "zoom_out": self._zoom_out,
+            "zoom_reset": preview_view.reset_zoom,
+        }
+        
     def _handle_shortcut(self, action):
         """Obsluha klávesových zkratek"""
-        if action == "help":
-            self.help_component.show_help()
-        elif action == "settings":
-            self.settings_component.show_settings_dialog()
-        elif action == "quit":
-            self.close()
-        elif action == "toggle_theme":
-            self.theme_manager.toggle_theme()
-        elif action == "next_plugin":
-            current_index = self.plugin_panel.plugin_list.currentRow()
-            next_index = (current_index + 1) % self.plugin_panel.plugin_list.count()
-            self.plugin_panel.plugin_list.setCurrentRow(next_index)
-        elif action == "prev_plugin":
-            current_index = self.plugin_panel.plugin_list.currentRow()
-            prev_index = (current_index - 1) % self.plugin_panel.plugin_list.count()
-            self.plugin_panel.plugin_list.setCurrentRow(prev_index)
-        elif action == "zoom_in":
-            self.content_panel.preview_view.scale(1.25, 1.25)
-        elif action == "zoom_out":
-            self.content_panel.preview_view.scale(0.8, 0.8)
-        elif action == "zoom_reset":
-            self.content_panel.preview_view.reset_zoom()
+        handler = self._shortcut_table.get(action)
+        if handler is not None:
+            handler()
+            
+    def _show_help(self):
+        """Zobrazí nápovědu (komponenta se vytvoří až teď)"""
+        self.help_component.show_help()
+        
+    def _next_plugin(self):
+        """Přepne na další plugin v seznamu"""
+        plugin_list = self.plugin_panel.plugin_list
+        count = plugin_list.count()
+        if count:
+            plugin_list.setCurrentRow((plugin_list.currentRow() + 1) % count)
+            
+    def _prev_plugin(self):
+        """Přepne na předchozí plugin v seznamu"""
+        plugin_list = self.plugin_panel.plugin_list
+        count = plugin_list.count()
+        if count:
+            plugin_list.setCurrentRow((plugin_list.currentRow() - 1) % count)
+            
+    def _zoom_in(self):
+        """Přiblíží náhled"""
+        self.content_panel.preview_view.scale(1.25, 1.25)
+        
+    def _zoom_out(self):
+        """Oddálí náhled"""
+        self.content_panel.preview_view.scale(0.8, 0.8)
             
     def _handle_notification(self, message, notification_type):
         """Obsluha notifikací ze stavového panelu"""
@@ -210,10 +271,11 @@ class ModernMainWindow(QMainWindow):
         # Aplikace změn tématu
         if "general/theme" in changed_settings:
             theme = changed_settings["general/theme"]
-            if theme == "light":
-                self.theme_manager.apply_theme(light=True)
-            elif theme == "dark":
-                self.theme_manager.apply_theme(light=False)
+            if theme in ("light", "dark"):
+                light = theme == "light"
+                # Téma se přepíná jen při skutečné změně
+                if light != self.theme_manager.is_light_theme:
+                    self.theme_manager.apply_theme(light=light)
             elif theme == "system":
                 # Zde by byla logika pro detekci systémového tématu
                 pass
@@ -246,7 +308,9 @@ class ModernMainWindow(QMainWindow):
                 return
                 
         # Uložení nastavení před ukončením
-        self.settings_component.set_setting("window/geometry", self.saveGeometry())
-        self.settings_component.set_setting("window/state", self.saveState())
+        self.settings_component.set_many({
+            "window/geometry": self.saveGeometry(),
+            "window/state": self.saveState(),
+        })
         
         event.accept()
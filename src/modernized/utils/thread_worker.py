@@ -2,12 +2,85 @@
 Modul pro práci s vlákny a asynchronními operacemi.
 """
 
+import inspect
 import threading
-import queue
-import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from functools import lru_cache, partial
 from typing import Callable, Any, Dict, List, Optional, Tuple
-from PySide6.QtCore import QObject, Signal, QThread, QTimer
+from PySide6.QtCore import QObject, Signal, Slot, Qt, QMetaObject, QThread, QRunnable, QThreadPool
+
+_CALLBACK_NAMES = ('progress_callback', 'status_callback')
+
+@lru_cache(maxsize=256)
+def _code_callbacks(code) -> Tuple[str, ...]:
+    """Vrátí názvy callbacků, které přijímá funkce s daným code objektem (cachuje se podle kódu)"""
+    names = code.co_varnames[code.co_posonlyargcount:code.co_argcount + code.co_kwonlyargcount]
+    accepts_any = bool(code.co_flags & inspect.CO_VARKEYWORDS)
+    return tuple(name for name in _CALLBACK_NAMES if accepts_any or name in names)
+
+def _accepted_callbacks(fn: Callable) -> Tuple[str, ...]:
+    """Vrátí názvy callbacků, které funkce přijímá"""
+    if isinstance(fn, partial):
+        # Callbacky zadané už v partial se nepřidávají (přepsaly by je)
+        return tuple(name for name in _accepted_callbacks(fn.func) if name not in fn.keywords)
+    # Dekorátory (functools.wraps) se rozbalí na původní funkci – obal s *args, **kwargs
+    # by jinak vypadal, že callbacky přijímá. Cache je klíčovaná code objektem,
+    # ne samotným callable – lambdy, closury ani vázané metody tak v cache nezůstávají
+    code = getattr(inspect.unwrap(getattr(fn, '__func__', fn)), '__code__', None)
+    if code is not None:
+        return _code_callbacks(code)
+    # Ostatní callable (vestavěné funkce, objekty s __call__) bez cache
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return ()
+    accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+    return tuple(name for name in _CALLBACK_NAMES
+                 if accepts_any or (name in params and params[name].kind is not inspect.Parameter.POSITIONAL_ONLY))
+
+def _bind_callbacks(fn: Callable, kwargs: dict, signals) -> dict:
+    """Doplní do kwargs jen ty callbacky, které funkce přijímá a volající je nepředal"""
+    names = _accepted_callbacks(fn)
+    callbacks = {'progress_callback': signals.progress, 'status_callback': signals.status}
+    for name in names:
+        if name not in kwargs:
+            kwargs[name] = callbacks[name]
+    return kwargs
+
+class _LazyTraceback:
+    """Traceback výjimky, který se na text převede až při prvním str()"""
+    __slots__ = ('exc', '_text')
+    
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+        self._text = None
+        
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(traceback.format_exception(type(self.exc), self.exc, self.exc.__traceback__))
+        return self._text
+
+def _run_task(fn: Callable, args: tuple, kwargs: dict, signals) -> None:
+    """Spustí funkci a výsledek, chybu i dokončení ohlásí přes signals (běží ve vlákně workeru)"""
+    # Emitování signálu started
+    signals.started.emit()
+    
+    try:
+        # Spuštění funkce (callbacky jsou navázané už v konstruktoru)
+        result = fn(*args, **kwargs)
+        
+        # Emitování výsledku
+        signals.result.emit(result)
+        
+    except Exception as e:
+        # Emitování chyby (traceback se formátuje až u příjemce, pokud ho potřebuje)
+        error_info = (str(e), _LazyTraceback(e))
+        signals.error.emit(error_info)
+        
+    finally:
+        # Emitování signálu finished
+        signals.finished.emit()
 
 class ThreadWorker(QObject):
     """
@@ -41,6 +114,34 @@ class ThreadWorker(QObject):
         progress = Signal(int)
         status = Signal(str)
         
+        # Pool recyklovaných instancí (omezuje alokaci QObjectů při dávkách úloh).
+        # Používá ho jen ThreadPool: po dokončení úlohy se instance předá další úloze,
+        # proto se na ni po skončení nesmí nic odkazovat (ani callbacky uložené úlohou).
+        _signal_pool = []
+        _pool_lock = threading.Lock()
+        _POOL_LIMIT = 64
+        
+        @classmethod
+        def acquire(cls) -> 'ThreadWorker.WorkerSignals':
+            """Vrátí instanci z poolu, případně vytvoří novou"""
+            with cls._pool_lock:
+                if cls._signal_pool:
+                    return cls._signal_pool.pop()
+            return cls()
+            
+        @Slot()
+        def recycle(self):
+            """Odpojí všechny sloty a vrátí instanci do poolu"""
+            for signal in (self.started, self.finished, self.error,
+                           self.result, self.progress, self.status):
+                try:
+                    signal.disconnect()
+                except (RuntimeError, TypeError):
+                    pass
+            with self._pool_lock:
+                if len(self._signal_pool) < self._POOL_LIMIT:
+                    self._signal_pool.append(self)
+        
     def __init__(self, fn: Callable, *args, **kwargs):
         """
         Inicializace workeru.
@@ -57,16 +158,18 @@ class ThreadWorker(QObject):
         self.args = args
         self.kwargs = kwargs
         
-        # Vytvoření signálů
+        # Vytvoření signálů (veřejné API workeru, proto se nerecyklují)
         self.signals = self.WorkerSignals()
+        _bind_callbacks(fn, self.kwargs, self.signals)
         
         # Vytvoření vlákna
         self.thread = QThread()
         self.moveToThread(self.thread)
         
-        # Propojení signálů
-        self.thread.started.connect(self._execute)
-        self.signals.finished.connect(self.thread.quit)
+        # Propojení signálů (started i quit() obslouží přímo vlákno workeru,
+        # uživatelské callbacky zůstávají na AutoConnection)
+        self.thread.started.connect(self._execute, Qt.DirectConnection)
+        self.signals.finished.connect(self.thread.quit, Qt.DirectConnection)
         self.signals.finished.connect(self.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         
@@ -76,34 +179,28 @@ class ThreadWorker(QObject):
         
     def _execute(self):
         """Spustí funkci v samostatném vlákně"""
-        # Emitování signálu started
-        self.signals.started.emit()
-        
-        try:
-            # Přidání progress_callback do kwargs, pokud funkce podporuje progress_callback
-            kwargs = self.kwargs
-            if 'progress_callback' not in kwargs:
-                kwargs['progress_callback'] = self.signals.progress
-                
-            # Přidání status_callback do kwargs, pokud funkce podporuje status_callback
-            if 'status_callback' not in kwargs:
-                kwargs['status_callback'] = self.signals.status
-                
-            # Spuštění funkce
-            result = self.fn(*self.args, **kwargs)
-            
-            # Emitování výsledku
-            self.signals.result.emit(result)
-            
-        except Exception as e:
-            # Emitování chyby
-            error_info = (str(e), traceback.format_exc())
-            self.signals.error.emit(error_info)
-            
-        finally:
-            # Emitování signálu finished
-            self.signals.finished.emit()
+        _run_task(self.fn, self.args, self.kwargs, self.signals)
             
+class _Runnable(QRunnable):
+    """Úloha pro QThreadPool – spustí funkci a výsledek ohlásí signály"""
+    
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        # Signály se vytváří v hlavním vlákně, sloty se tak volají v něm
+        self.signals = ThreadWorker.WorkerSignals.acquire()
+        _bind_callbacks(fn, self.kwargs, self.signals)
+        
+    def run(self):
+        signals = self.signals
+        _run_task(self.fn, self.args, self.kwargs, signals)
+        # Úloha už na signály (ani na callbacky v kwargs) neukazuje – po recyklaci
+        # patří další úloze; vrácení do poolu až po doručení čekajících slotů
+        self.signals = self.fn = self.args = self.kwargs = None
+        QMetaObject.invokeMethod(signals, "recycle", Qt.QueuedConnection)
+        
 class ThreadPool:
     """
     Třída pro správu více vláken.
@@ -125,26 +222,28 @@ class ThreadPool:
     ```
     """
     
-    def __init__(self, max_threads: int = 4):
+    def __init__(self, max_threads: Optional[int] = None):
         """
         Inicializace thread poolu.
         
         Args:
             max_threads: Maximální počet současně běžících vláken
+                         (výchozí QThread.idealThreadCount())
         """
+        if max_threads is None:
+            max_threads = QThread.idealThreadCount()
         self.max_threads = max_threads
-        self.active_workers = []
-        self.task_queue = queue.Queue()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._process_queue)
-        self.timer.start(100)  # Kontrola fronty každých 100 ms
+        # Vlákna se znovu používají, frontu úkolů drží QThreadPool
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
         
     def add_task(self, fn: Callable, *args, 
                  on_result: Optional[Callable] = None,
                  on_error: Optional[Callable] = None,
                  on_progress: Optional[Callable] = None,
                  on_finished: Optional[Callable] = None,
-                 **kwargs) -> ThreadWorker:
+                 priority: int = 0,
+                 **kwargs) -> _Runnable:
         """
         Přidá úkol do fronty.
         
@@ -155,49 +254,125 @@ class ThreadPool:
             on_error: Callback pro chybu
             on_progress: Callback pro průběh
             on_finished: Callback pro dokončení
+            priority: Priorita ve frontě (vyšší hodnota se spustí dřív)
             **kwargs: Klíčové argumenty pro funkci
             
         Returns:
-            ThreadWorker: Instance workeru
+            _Runnable: Úloha (signály v atributu signals; po dokončení úlohy
+                       je atribut None, protože signály převezme další úloha)
         """
-        # Vytvoření workeru
-        worker = ThreadWorker(fn, *args, **kwargs)
+        # Vytvoření úlohy
+        task = _Runnable(fn, *args, **kwargs)
         
         # Propojení callbacků
         if on_result:
-            worker.signals.result.connect(on_result)
+            task.signals.result.connect(on_result)
         if on_error:
-            worker.signals.error.connect(on_error)
+            task.signals.error.connect(on_error)
         if on_progress:
-            worker.signals.progress.connect(on_progress)
+            task.signals.progress.connect(on_progress)
         if on_finished:
-            worker.signals.finished.connect(on_finished)
+            task.signals.finished.connect(on_finished)
             
-        # Přidání do fronty
-        self.task_queue.put(worker)
+        # Předání do poolu (spustí se, jakmile je volné vlákno)
+        self._pool.start(task, priority)
         
-        # Zpracování fronty
-        self._process_queue()
+        return task
         
-        return worker
+    @property
+    def active_count(self) -> int:
+        """Počet právě běžících úkolů (čítač QThreadPool, bez procházení workerů)"""
+        return self._pool.activeThreadCount()
         
-    def _process_queue(self):
-        """Zpracuje frontu úkolů"""
-        # Odstranění dokončených workerů
-        self.active_workers = [w for w in self.active_workers if w.thread.isRunning()]
+    def wait_for_all(self, timeout: Optional[float] = None) -> bool:
+        """
+        Čeká na dokončení všech úkolů.
         
-        # Spuštění nových workerů, pokud je místo
-        while len(self.active_workers) < self.max_threads and not self.task_queue.empty():
-            worker = self.task_queue.get()
-            worker.signals.finished.connect(lambda w=worker: self._worker_finished(w))
-            self.active_workers.append(worker)
-            worker.start()
+        Args:
+            timeout: Timeout v sekundách
             
-    def _worker_finished(self, worker: ThreadWorker):
-        """Callback pro dokončení workeru"""
-        if worker in self.active_workers:
-            self.active_workers.remove(worker)
+        Returns:
+            bool: True, pokud byly všechny úkoly dokončeny, False pokud vypršel timeout
+        """
+        return self._pool.waitForDone(-1 if timeout is None else int(timeout * 1000))
+        
+    def cancel_all(self):
+        """Zruší všechny úkoly čekající ve frontě (běžící úkoly nelze přerušit)"""
+        self._pool.clear()
+        
+class LightThreadPool:
+    """
+    Odlehčený pool pro výpočetní úlohy bez vazby na GUI.
+    
+    Nepoužívá QObjecty ani signály – úlohy běží v concurrent.futures.ThreadPoolExecutor
+    a callbacky se volají přímo ve vlákně, které úlohu dokončilo. Z callbacků proto
+    nesahejte na widgety; pro práci s UI použijte ThreadPool.
+    
+    Příklad použití:
+    ```python
+    pool = LightThreadPool(max_threads=4)
+    pool.add_task(compute_tile, tile, on_result=results.append)
+    pool.wait_for_all()
+    ```
+    """
+    
+    def __init__(self, max_threads: Optional[int] = None):
+        """
+        Inicializace poolu.
+        
+        Args:
+            max_threads: Maximální počet současně běžících vláken
+                         (výchozí QThread.idealThreadCount())
+        """
+        if max_threads is None:
+            max_threads = QThread.idealThreadCount()
+        self.max_threads = max_threads
+        self._executor = ThreadPoolExecutor(max_workers=max_threads)
+        self._futures = set()
+        self._lock = threading.Lock()
+        
+    def add_task(self, fn: Callable, *args,
+                 on_result: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None,
+                 **kwargs) -> Future:
+        """
+        Přidá úkol do fronty.
+        
+        Args:
+            fn: Funkce, která bude spuštěna v samostatném vlákně
+            *args: Argumenty pro funkci
+            on_result: Callback pro výsledek
+            on_error: Callback pro chybu, dostane n-tici (zpráva, traceback) jako ThreadPool
+            **kwargs: Klíčové argumenty pro funkci
             
+        Returns:
+            Future: Budoucí výsledek úkolu
+        """
+        future = self._executor.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(partial(self._on_done, on_result, on_error))
+        return future
+        
+    def _on_done(self, on_result: Optional[Callable], on_error: Optional[Callable], future: Future):
+        """Předá výsledek nebo chybu dokončeného úkolu callbackům"""
+        with self._lock:
+            self._futures.discard(future)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            if on_result:
+                on_result(future.result())
+        elif on_error:
+            on_error((str(exc), _LazyTraceback(exc)))
+            
+    @property
+    def active_count(self) -> int:
+        """Počet úkolů, které ještě nedoběhly (běžících i čekajících ve frontě)"""
+        with self._lock:
+            return len(self._futures)
+        
     def wait_for_all(self, timeout: Optional[float] = None) -> bool:
         """
         Čeká na dokončení všech úkolů.
@@ -208,34 +383,18 @@ class ThreadPool:
         Returns:
             bool: True, pokud byly všechny úkoly dokončeny, False pokud vypršel timeout
         """
-        start_time = time.time()
-        
-        while not self.task_queue.empty() or self.active_workers:
-            # Kontrola timeoutu
-            if timeout is not None and time.time() - start_time > timeout:
-                return False
-                
-            # Zpracování fronty
-            self._process_queue()
-            
-            # Pauza
-            time.sleep(0.1)
-            
-        return True
+        with self._lock:
+            pending = list(self._futures)
+        _, not_done = wait_futures(pending, timeout=timeout)
+        return not not_done
         
     def cancel_all(self):
-        """Zruší všechny úkoly"""
-        # Vyprázdnění fronty
-        while not self.task_queue.empty():
-            try:
-                self.task_queue.get_nowait()
-            except queue.Empty:
-                break
-                
-        # Ukončení běžících workerů
-        for worker in self.active_workers:
-            if worker.thread.isRunning():
-                worker.thread.quit()
-                worker.thread.wait(1000)  # Čekání max 1 sekundu
-                
-        self.active_workers = []
\ No newline at end of file
+        """Zruší všechny úkoly čekající ve frontě (běžící úkoly nelze přerušit)"""
+        with self._lock:
+            pending = list(self._futures)
+        for future in pending:
+            future.cancel()
+            
+    def shutdown(self, wait: bool = True):
+        """Ukončí pool; nové úkoly už nelze přidávat"""
+        self._executor.shutdown(wait=wait)
@@ -1,27 +1,276 @@
+import asyncio
+import shlex
 import subprocess
+import threading
 import logging
-from typing import List, Tuple
+import queue
+import time
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
 
-# Configure logger for this module
+# Module logger - levels and handlers are configured by the application entry point
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:
-    # Configure log handler only once (streaming to stdout)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
-def run_command(cmd: List[str]) -> Tuple[str, str]:
+logger.addHandler(logging.NullHandler())
+
+# Maximum number of output bytes written to the success and failure logs
+LOG_OUTPUT_BYTES = 512
+
+def decode_for_log(buf: bytes, n: int = LOG_OUTPUT_BYTES) -> str:
+    """Dekóduje jen prvních n bajtů výstupu (pro logování, neplatné znaky nahradí)"""
+    return buf[:n].decode(errors="replace")
+
+class CommandError(subprocess.CalledProcessError):
+    """Příkaz skončil s nenulovým návratovým kódem; na rozdíl od rodiče uvádí ve zprávě i stderr"""
+    
+    def __str__(self):
+        message = super().__str__()
+        if self.stderr:
+            stderr = self.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode(errors="replace")
+            return f"{message}\n{stderr.strip()}"
+        return message
+
+def _pump_lines(stream, sink: deque, name: str) -> None:
+    """Čte řádky z roury průběžně, ukládá je do sink a loguje je"""
+    log_lines = logger.isEnabledFor(logging.DEBUG)
+    count = 0
+    with stream:
+        for line in stream:
+            sink.append(line)
+            count += 1
+            if log_lines:
+                logger.debug(line.rstrip().decode(errors="replace"))
+    if sink.maxlen is not None and count > sink.maxlen:
+        logger.warning("Command %s truncated: kept last %d of %d lines", name, sink.maxlen, count)
+
+def run_command(cmd: List[str], max_output_lines: Optional[int] = None) -> Tuple[bytes, bytes]:
+    """
+    Spustí zadaný příkaz v podprocesu, počká na dokončení a vrátí stdout a stderr
+    jako bajty (volající si je dekóduje, až když text opravdu potřebuje).
+    Pokud příkaz skončí s nenulovým návratovým kódem, vyvolá CommandError
+    (podtřída subprocess.CalledProcessError, jako subprocess.run s check=True).
+    
+    Výstup se čte průběžně po řádcích (loguje se hned, jak přichází) a vrací se
+    celý. Pokud je zadáno max_output_lines, uchová se z každého proudu jen tolik
+    posledních řádků (oříznutí se zaloguje jako varování).
     """
-    Spustí zadaný příkaz v podprocesu, počká na dokončení a vrátí stdout a stderr.
-    Pokud příkaz skončí s nenulovým návratovým kódem, vyvolá výjimku.
+    # The command string is joined at most once, and only when something logs it
+    cmd_str = None
+    if logger.isEnabledFor(logging.INFO):
+        cmd_str = " ".join(cmd)
+        logger.info("Executing command: %s", cmd_str)
+    out_lines = deque(maxlen=max_output_lines)
+    err_lines = deque(maxlen=max_output_lines)
+    # Popen as a context manager closes the pipes and reaps the process like subprocess.run
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        readers = [
+            threading.Thread(target=_pump_lines, args=(proc.stdout, out_lines, "stdout"), daemon=True),
+            threading.Thread(target=_pump_lines, args=(proc.stderr, err_lines, "stderr"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        returncode = proc.wait()
+        for reader in readers:
+            reader.join()
+    stdout = b"".join(out_lines)
+    stderr = b"".join(err_lines)
+    if returncode != 0:
+        if cmd_str is None:
+            cmd_str = " ".join(cmd)
+        logger.error("Command '%s' failed (truncated): %s", cmd_str, decode_for_log(stderr).rstrip())
+        raise CommandError(returncode, cmd, stdout, stderr)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Command executed successfully. Output (truncated): %s", decode_for_log(stdout).rstrip())
+    return stdout, stderr
+
+async def run_command_async(cmd: List[str]) -> Tuple[bytes, bytes]:
+    """
+    Asynchronní varianta run_command – spustí příkaz přes asyncio, takže více
+    příkazů může běžet souběžně v jednom vlákně (např. přes asyncio.gather).
+    Pokud příkaz skončí s nenulovým návratovým kódem, vyvolá CommandError.
     """
-    logger.info("Executing command: " + " ".join(cmd))
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    stdout, stderr = proc.communicate()
+    cmd_str = None
+    if logger.isEnabledFor(logging.INFO):
+        cmd_str = " ".join(cmd)
+        logger.info("Executing command: %s", cmd_str)
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.PIPE)
+    stdout, stderr = await proc.communicate()
     if proc.returncode != 0:
-        logger.error(f"Command '{' '.join(cmd)}' failed: {stderr}")
-        raise Exception(f"Command '{' '.join(cmd)}' failed: {stderr}")
-    logger.info("Command executed successfully. Output: " + stdout.strip())
+        if cmd_str is None:
+            cmd_str = " ".join(cmd)
+        logger.error("Command '%s' failed (truncated): %s", cmd_str, decode_for_log(stderr).rstrip())
+        raise CommandError(proc.returncode, cmd, stdout, stderr)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Command executed successfully. Output (truncated): %s", decode_for_log(stdout).rstrip())
     return stdout, stderr
+
+class PersistentProcessPool:
+    """
+    Malá LRU zásoba dlouhožijících procesů pro opakovaně volané nástroje.
+    
+    Nástroj musí umět číst příkazy po řádcích ze stdin (např. `python -u` wrapper)
+    a odpověď ukončit řádkem `terminator`. Ušetří se tím start procesu při každém
+    volání. Nástroje, které tento režim neumí (nejdou spustit nebo skončí dřív,
+    než převezmou příkaz), se dál spouští klasicky přes run_command.
+    
+    Jakmile je příkaz odeslán, už se znovu nespouští: pokud proces do `timeout`
+    sekund neodpoví nebo skončí, ukončí se a volající dostane TimeoutError/EOFError
+    (příkaz mohl proběhnout, opakování by ho provedlo podruhé).
+    """
+    
+    def __init__(self, max_processes: int = 4, terminator: str = "__END__", timeout: float = 30.0,
+                 startup_grace: float = 0.1):
+        self.max_processes = max_processes
+        self.terminator = terminator
+        self.timeout = timeout
+        # Jak dlouho musí nově spuštěný proces vydržet běžet, aby se považoval za REPL
+        self.startup_grace = startup_grace
+        # launch_cmd -> (Popen, fronta řádků stdout), nejdéle nepoužitý první
+        self._processes = OrderedDict()
+        self._unsupported = set()
+        # Zámek poolu chrání jen evidenci (LRU, seznam nepodporovaných nástrojů);
+        # spuštění procesu a výměnu příkazu serializuje zámek daného nástroje
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        
+    def run_persistent(self, launch_cmd: List[str], args: List[str]) -> str:
+        """
+        Pošle příkaz `args` živému procesu spuštěnému přes `launch_cmd` a vrátí jeho výstup.
+        
+        Raises:
+            TimeoutError: Proces po převzetí příkazu neodpověděl do timeout sekund
+            EOFError: Proces po převzetí příkazu skončil bez odpovědi
+        """
+        key = tuple(launch_cmd)
+        with self._lock:
+            key_lock = None if key in self._unsupported else self._key_locks.setdefault(key, threading.Lock())
+        if key_lock is not None:
+            with key_lock:
+                entry = self._get_process(key)
+                if entry is not None:
+                    proc, lines = entry
+                    try:
+                        proc.stdin.write(shlex.join(args) + "\n")
+                        proc.stdin.flush()
+                    except OSError:
+                        # Proces skončil dřív, než příkaz převzal – nástroj REPL neumí
+                        self._mark_unsupported(key)
+                    else:
+                        try:
+                            return self._read_reply(lines)
+                        except (TimeoutError, EOFError):
+                            # Příkaz už mohl proběhnout – proces zahodíme, ale neopakujeme
+                            self._discard(key)
+                            raise
+        return run_command(list(launch_cmd) + list(args))[0].decode(errors="replace")
+        
+    def _get_process(self, key: tuple) -> Optional[Tuple[subprocess.Popen, queue.Queue]]:
+        """
+        Vrátí živý proces pro klíč, případně spustí nový a vyřadí nejdéle nepoužité
+        (volá se pod zámkem klíče). Vrátí None, pokud nástroj režim REPL neumí.
+        """
+        with self._lock:
+            entry = self._processes.get(key)
+            if entry is not None:
+                self._processes.move_to_end(key)
+        if entry is not None and entry[0].poll() is None:
+            return entry
+        self._discard(key)
+        try:
+            proc = subprocess.Popen(list(key), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    text=True, bufsize=1)
+        except OSError:
+            self._mark_unsupported(key)
+            return None
+        try:
+            proc.wait(timeout=self.startup_grace)
+        except subprocess.TimeoutExpired:
+            pass
+        else:
+            # Proces skončil sám, aniž by četl příkazy
+            self._close_process(proc)
+            self._mark_unsupported(key)
+            return None
+        # stdout čte samostatné vlákno, aby šlo na odpověď čekat s časovým limitem
+        lines = queue.Queue()
+        threading.Thread(target=self._pump_stdout, args=(proc.stdout, lines), daemon=True).start()
+        entry = (proc, lines)
+        evicted = []
+        with self._lock:
+            self._processes[key] = entry
+            # Vyřazují se jen procesy, které zrovna nikdo nepoužívá (volný zámek klíče)
+            for old_key in list(self._processes):
+                if len(self._processes) <= self.max_processes:
+                    break
+                old_lock = self._key_locks[old_key]
+                if old_lock.acquire(blocking=False):
+                    try:
+                        evicted.append(self._processes.pop(old_key)[0])
+                    finally:
+                        old_lock.release()
+        for old_proc in evicted:
+            self._close_process(old_proc)
+        return entry
+        
+    @staticmethod
+    def _pump_stdout(stream, lines: queue.Queue) -> None:
+        """Předává řádky stdout do fronty; konec výstupu označí None"""
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+        
+    def _read_reply(self, lines: queue.Queue) -> str:
+        """Přečte odpověď až po ukončovací řádek (nejvýše timeout sekund)"""
+        deadline = time.monotonic() + self.timeout
+        output = []
+        while True:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError("Persistent process did not answer in time") from None
+            if line is None:
+                raise EOFError("Persistent process closed its output")
+            if line.rstrip("\r\n") == self.terminator:
+                return "".join(output)
+            output.append(line)
+            
+    def _mark_unsupported(self, key: tuple) -> None:
+        """Zahodí proces nástroje a příště ho spustí klasicky"""
+        self._discard(key)
+        with self._lock:
+            self._unsupported.add(key)
+        
+    def _discard(self, key: tuple) -> None:
+        with self._lock:
+            entry = self._processes.pop(key, None)
+        if entry is not None:
+            self._close_process(entry[0])
+            
+    @staticmethod
+    def _close_process(proc: subprocess.Popen) -> None:
+        """Ukončí proces zavřením stdin, případně násilně"""
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+            
+    def close(self) -> None:
+        """Ukončí všechny živé procesy"""
+        with self._lock:
+            procs = [proc for proc, _ in self._processes.values()]
+            self._processes.clear()
+        for proc in procs:
+            self._close_process(proc)
+                
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.close()